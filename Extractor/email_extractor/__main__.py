@@ -0,0 +1,8 @@
+"""
+Entry point for running the Email Extractor with: python -m email_extractor
+"""
+
+from email_extractor.main import run
+
+if __name__ == "__main__":
+    run()
@@ -2,6 +2,9 @@
 Configuration settings for the Email Extractor.
 """
 
+import os
+import re
+
 # Timeout settings (in seconds)
 HTTP_TIMEOUT = 15  # Reduced from 30
 PLAYWRIGHT_TIMEOUT = 20  # Reduced from 60
@@ -10,6 +13,11 @@ COOKIE_BANNER_TIMEOUT = 3  # Timeout for cookie banner handling
 PAGE_NAVIGATION_TIMEOUT = 15  # Timeout for page navigation
 CONTACT_PAGE_SEARCH_TIMEOUT = 10  # Timeout for contact page search
 
+# HTTP client settings
+HTTP_MAX_CONNECTIONS = 20  # Maximum open connections in the shared client pool
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10  # Idle connections kept open for reuse
+HTTP_MAX_CONCURRENT_REQUESTS = 8  # Requests in flight at once, across all concurrent fetches
+
 # Retry settings
 MAX_RETRIES = 2  # Reduced from 3
 RETRY_BACKOFF_FACTOR = 1  # Reduced from 2
@@ -31,6 +39,18 @@ USER_AGENTS = [
 HEADLESS = True
 BROWSER_TYPE = "chromium"  # Options: chromium, firefox, webkit
 SLOW_MO = 10  # Reduced from 50ms
+PLAYWRIGHT_CONTEXT_POOL_SIZE = 3  # Browser contexts used for concurrent page extraction
+PLAYWRIGHT_RESULT_CACHE_SIZE = 256  # Pages whose extracted emails are kept, so revisits skip the navigation
+PLAYWRIGHT_RESULT_CACHE_TTL = 3600  # Seconds before a cached page is navigated to again
+# Resource types the browser doesn't download, as extraction only needs the HTML, scripts
+# and stylesheets (whose content properties are scanned, and which decide what is visible)
+BLOCKED_RESOURCE_TYPES = frozenset(["image", "font", "media", "imageset", "beacon"])
+# Tracking, analytics and ad hosts whose requests are aborted, matched against the request's host
+BLOCKED_URL_PATTERNS = [
+    "doubleclick.net", "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "connect.facebook.com", "hotjar.com", "scorecardresearch.com",
+    "fonts.googleapis.com", "fonts.gstatic.com", "adservice.google.com", "clarity.ms", "segment.io",
+]
 
 # Output settings
 OUTPUT_FILE = "output.txt"
@@ -41,6 +61,10 @@ ACCEPT_COOKIE_KEYWORDS = [
     "accept", "accept all", "agree", "ok", "got it", "i understand", 
     "akzeptieren", "accepter", "aceptar", "aceitar", "accetto"
 ]
+# Precompiled case-insensitive matcher for any of the keywords above
+ACCEPT_COOKIE_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in ACCEPT_COOKIE_KEYWORDS), re.IGNORECASE
+)
 
 # Enhanced extraction settings
 ENABLE_OCR = False  # Set to True if pytesseract is installed
@@ -49,6 +73,10 @@ ENABLE_INTERACTION_SIMULATION = True
 ENABLE_PAGE_SCROLLING = True
 ENABLE_ADVANCED_OBFUSCATION = True
 VERIFY_MX_RECORDS = True  # Set to False to disable MX record verification
+MX_ACCEPT_ON_LOOKUP_FAILURE = True  # Keep emails whose MX lookup failed or timed out (False skips them)
+MX_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mx_cache")  # File that MX results are kept in between runs (None keeps them in memory only)
+MX_CACHE_TTL = 86400  # Seconds before a cached MX result is looked up again
+MX_LOOKUP_TIMEOUT = 2  # Seconds an uncached MX lookup may take before it counts as failed (not cached)
 
 # Interaction settings
 MAX_INTERACTIONS = 10  # Maximum number of elements to interact with
@@ -3,14 +3,14 @@ Crawler module for the Email Extractor.
 """
 
 import asyncio
-from urllib.parse import urlparse
 import time
+from async_timeout import timeout
 
 from email_extractor.config import (
-    MAX_CONTACT_PAGES, MAX_PAGES_PER_DOMAIN, GLOBAL_TIMEOUT,
+    MAX_CONTACT_PAGES, MAX_PAGES_PER_DOMAIN, MAX_DEPTH, GLOBAL_TIMEOUT,
     CONTACT_PAGE_SEARCH_TIMEOUT
 )
-from email_extractor.utils import normalize_url, is_same_domain, logger
+from email_extractor.utils import get_domain, logger
 
 class Crawler:
     """Handles the crawling logic for finding contact pages."""
@@ -26,24 +26,20 @@ class Crawler:
         self.http_handler = http_handler
         self.playwright_handler = playwright_handler
         self.visited_urls = set()
-        self.contact_pages = []
-        self.start_time = None
+        self.contact_pages = {}  # Insertion-ordered, so keys keep the crawl ranking
+        self._deadline = None  # time.monotonic() value at which the global timeout expires
+        self._base_domain = None  # Registered domain of the site being crawled
     
     def _is_timeout_reached(self):
         """Check if the global timeout has been reached."""
-        if not self.start_time:
-            return False
-        
-        elapsed = time.time() - self.start_time
-        return elapsed >= GLOBAL_TIMEOUT
+        return self._deadline is not None and time.monotonic() >= self._deadline
     
-    def _should_visit_url(self, url, base_url):
+    def _should_visit_url(self, url):
         """
         Determine if a URL should be visited.
         
         Args:
             url (str): The URL to check
-            base_url (str): The base URL of the website
             
         Returns:
             bool: True if the URL should be visited, False otherwise
@@ -52,10 +48,6 @@ class Crawler:
         if url in self.visited_urls:
             return False
         
-        # Skip if not the same domain
-        if not is_same_domain(url, base_url):
-            return False
-        
         # Skip if we've reached the maximum number of pages
         if len(self.visited_urls) >= MAX_PAGES_PER_DOMAIN:
             return False
@@ -64,6 +56,10 @@ class Crawler:
         if self._is_timeout_reached():
             return False
         
+        # Skip if not the same domain (checked last, as it has to parse the URL)
+        if get_domain(url) != self._base_domain:
+            return False
+        
         return True
     
     async def find_contact_pages(self, url):
@@ -77,10 +73,10 @@ class Crawler:
             list: List of contact page URLs
         """
         try:
-            # Create a task with timeout
-            crawl_task = asyncio.create_task(self._find_contact_pages_impl(url))
+            # Run in place under a timeout scope (no extra task is scheduled)
             try:
-                return await asyncio.wait_for(crawl_task, timeout=CONTACT_PAGE_SEARCH_TIMEOUT)
+                async with timeout(CONTACT_PAGE_SEARCH_TIMEOUT):
+                    return await self._find_contact_pages_impl(url)
             except asyncio.TimeoutError:
                 logger.warning(f"Contact page search timed out for {url}")
                 return []
@@ -90,65 +86,87 @@ class Crawler:
 
     async def _find_contact_pages_impl(self, url):
         """Implementation of contact page finding with proper error handling."""
-        self.start_time = time.time()
+        self._deadline = time.monotonic() + GLOBAL_TIMEOUT
         self.visited_urls = set()
-        self.contact_pages = []
+        self.contact_pages = {}
+        self._base_domain = get_domain(url)  # Parsed once per crawl rather than once per link
         
-        # Start with the homepage
-        await self._crawl_for_contact_pages(url, url)
+        # Crawl breadth-first from the homepage, fetching each level concurrently
+        await self._crawl_for_contact_pages(url)
         
         # Limit to the top MAX_CONTACT_PAGES contact pages
-        return self.contact_pages[:MAX_CONTACT_PAGES]
+        return list(self.contact_pages)[:MAX_CONTACT_PAGES]
     
-    async def _crawl_for_contact_pages(self, url, base_url):
+    async def _crawl_for_contact_pages(self, base_url):
         """
-        Recursively crawl for contact pages.
+        Crawl for contact pages level by level, up to MAX_DEPTH levels deep.
+        
+        The homepage forms the first level, and the contact pages newly found
+        on one level are crawled as the next one.
         
         Args:
-            url (str): The current URL to crawl
             base_url (str): The base URL of the website
         """
-        # Check if we should stop crawling
-        if self._is_timeout_reached() or len(self.contact_pages) >= MAX_CONTACT_PAGES:
-            return
-        
-        # Skip if we shouldn't visit this URL
-        if not self._should_visit_url(url, base_url):
-            return
-        
-        # Mark as visited
-        self.visited_urls.add(url)
-        
-        # Try HTTP request first
-        html_text, soup = self.http_handler.fetch_url(url)
-        
-        # If HTTP request failed and Playwright is available, try with Playwright
-        if (not html_text or not soup) and self.playwright_handler:
-            success, html_content, soup = await self.playwright_handler.navigate_to_url(url)
-            if not success or not soup:
+        frontier = [base_url]
+        depth = 0
+        while frontier and depth < MAX_DEPTH:
+            # Check if we should stop crawling
+            if self._is_timeout_reached() or len(self.contact_pages) >= MAX_CONTACT_PAGES:
                 return
+            
+            # Pick the pages of this level we should visit, and mark them as visited
+            level = []
+            for url in frontier:
+                if self._should_visit_url(url):
+                    self.visited_urls.add(url)
+                    level.append(url)
+            
+            # Fetch every page of the level concurrently. Only the homepage is
+            # recorded as visited in the handlers, so the extractor can still
+            # extract from the contact pages crawled here (the HTTP handler keeps
+            # the pages it fetched, so they aren't downloaded twice)
+            results = await asyncio.gather(
+                *(self._find_contact_links(url, base_url, track_visit=depth == 0) for url in level),
+                return_exceptions=True
+            )
+            
+            # Add contact pages to the list, in crawl order so the ranking is kept
+            frontier = []
+            for url, contact_urls in zip(level, results):
+                if isinstance(contact_urls, Exception):
+                    logger.error(f"Error crawling {url}: {str(contact_urls)}")
+                    continue
+                
+                for contact_url in contact_urls:
+                    if len(self.contact_pages) >= MAX_CONTACT_PAGES:
+                        break
+                    if contact_url not in self.contact_pages:
+                        self.contact_pages[contact_url] = True
+                        frontier.append(contact_url)
+            
+            depth += 1
+    
+    async def _find_contact_links(self, url, base_url, track_visit=True):
+        """
+        Fetch a page and find the contact page links on it.
         
-        # If we still don't have a soup, return
-        if not soup:
-            return
-        
-        # Find contact pages from the current page
-        if self.playwright_handler and hasattr(self.playwright_handler, 'page'):
-            # Use Playwright if available
-            contact_urls = await self.playwright_handler.find_contact_pages(base_url)
-        else:
-            # Fallback to HTTP handler
-            contact_urls = self.http_handler.find_contact_pages(base_url, soup)
-        
-        # Add contact pages to the list
-        for contact_url in contact_urls:
-            if contact_url not in self.contact_pages and len(self.contact_pages) < MAX_CONTACT_PAGES:
-                self.contact_pages.append(contact_url)
+        Args:
+            url (str): The URL to fetch
+            base_url (str): The base URL of the website
+            track_visit (bool): Record the URL as visited in the handlers, so they
+                skip it when it is requested again
+            
+        Returns:
+            list: Contact page URLs found on the page, sorted by relevance
+        """
+        # Try HTTP request first
+        html_text, tree = await self.http_handler.fetch_url(url, track_visit=track_visit)
+        if html_text and tree is not None:
+            return self.http_handler.find_contact_pages(base_url, tree)
         
-        # If we have enough contact pages, return
-        if len(self.contact_pages) >= MAX_CONTACT_PAGES:
-            return
+        # If HTTP request failed and Playwright is available, try with Playwright (on a
+        # pooled page, so the pages of a level load concurrently)
+        if not self.playwright_handler:
+            return []
         
-        # If we've reached the timeout, return
-        if self._is_timeout_reached():
-            return
\ No newline at end of file
+        return await self.playwright_handler.find_contact_pages_from_url(url, base_url, track_visit=track_visit)
\ No newline at end of file
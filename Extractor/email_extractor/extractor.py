@@ -3,11 +3,66 @@ Core email extraction logic for the Email Extractor.
 """
 
 import asyncio
+import atexit
+import shelve
 import time
-from urllib.parse import urlparse
 
-from email_extractor.config import MAX_CONTACT_PAGES, GLOBAL_TIMEOUT, VERIFY_MX_RECORDS
-from email_extractor.utils import logger, normalize_url, is_valid_url, verify_mx_record, get_email_domain
+from email_extractor.config import (
+    GLOBAL_TIMEOUT, VERIFY_MX_RECORDS, MX_ACCEPT_ON_LOOKUP_FAILURE,
+    MX_CACHE_FILE, MX_CACHE_TTL, MX_LOOKUP_TIMEOUT
+)
+from email_extractor.utils import (
+    logger, normalize_url, is_valid_url, verify_mx_record, verify_mx_record_async, get_email_domain
+)
+
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+# MX lookup results as (has_mx, expiry timestamp) tuples keyed by domain. They are
+# read from MX_CACHE_FILE when the extractor is created and written back at exit, so
+# the lookups made from the event loop never touch the file
+_mx_record_cache = None
+
+def _get_mx_record_cache():
+    """
+    Load the MX record cache from MX_CACHE_FILE on first use.
+    
+    Returns:
+        dict: The cache (only kept in memory if persistence is disabled or fails)
+    """
+    global _mx_record_cache
+    if _mx_record_cache is None:
+        _mx_record_cache = {}
+        if MX_CACHE_FILE:
+            try:
+                with shelve.open(MX_CACHE_FILE) as shelf:
+                    _mx_record_cache.update(shelf)
+                atexit.register(_save_mx_record_cache)
+            except Exception as e:
+                logger.warning(f"Could not open MX cache file {MX_CACHE_FILE}: {str(e)}")
+    return _mx_record_cache
+
+def _save_mx_record_cache():
+    """Write the unexpired entries of the MX record cache back to MX_CACHE_FILE."""
+    now = time.time()
+    try:
+        with shelve.open(MX_CACHE_FILE, 'n') as shelf:
+            shelf.update((domain, entry) for domain, entry in _mx_record_cache.items() if entry[1] >= now)
+    except Exception as e:
+        logger.warning(f"Could not save MX cache file {MX_CACHE_FILE}: {str(e)}")
+
+def _get_cached_mx_record(domain):
+    """Return the cached MX result for a domain, or None if it is missing or expired."""
+    entry = _get_mx_record_cache().get(domain)
+    if entry is None or entry[1] < time.time():
+        return None
+    return entry[0]
+
+def _cache_mx_record(domain, has_mx):
+    """Store the MX result for a domain for MX_CACHE_TTL seconds."""
+    _get_mx_record_cache()[domain] = (has_mx, time.time() + MX_CACHE_TTL)
 
 class EmailExtractor:
     """Handles the email extraction process."""
@@ -24,16 +79,18 @@ class EmailExtractor:
         self.http_handler = http_handler
         self.playwright_handler = playwright_handler
         self.crawler = crawler
-        self.start_time = None
+        self._deadline = None  # time.monotonic() value at which the global timeout expires
+        self._resolver = None  # Shared aiodns resolver, created on first use
         self.extracted_emails = set()
+        self._canonical_emails = set()  # Lowercased forms of extracted_emails, for case-insensitive dedupe
+        
+        if VERIFY_MX_RECORDS:
+            # Read the MX record cache now rather than from the event loop
+            _get_mx_record_cache()
     
     def _is_timeout_reached(self):
         """Check if the global timeout has been reached."""
-        if not self.start_time:
-            return False
-        
-        elapsed = time.time() - self.start_time
-        return elapsed >= GLOBAL_TIMEOUT
+        return self._deadline is not None and time.monotonic() >= self._deadline
     
     def _normalize_input_url(self, url):
         """
@@ -67,8 +124,17 @@ class EmailExtractor:
         Returns:
             set: Set of extracted email addresses
         """
-        self.start_time = time.time()
+        self._deadline = time.monotonic() + GLOBAL_TIMEOUT
         self.extracted_emails = set()
+        self._canonical_emails = set()
+        
+        # The handlers are reused across runs, so forget the pages visited for earlier URLs
+        self.http_handler.visited_urls = set()
+        self.http_handler.fetched_pages = {}
+        self.playwright_handler.visited_urls = set()
+        
+        # Use one user agent for all requests to this site
+        self.http_handler.rotate_user_agent()
         
         # Normalize the input URL
         normalized_url = self._normalize_input_url(url)
@@ -78,8 +144,8 @@ class EmailExtractor:
         logger.info(f"Starting email extraction for: {normalized_url}")
         
         # Step 1: Try to extract emails from the homepage using HTTP
-        homepage_emails = self.http_handler.extract_emails_from_page(normalized_url)
-        self._add_emails(homepage_emails)
+        homepage_emails = await self.http_handler.extract_emails_from_page(normalized_url)
+        await self._add_emails(homepage_emails)
         
         # If we found emails, we're done - no need for Playwright
         if self.extracted_emails:
@@ -89,17 +155,14 @@ class EmailExtractor:
         # Step 2: Find contact pages
         contact_pages = await self.crawler.find_contact_pages(normalized_url)
         
-        # Step 3: Extract emails from contact pages using HTTP
-        for contact_url in contact_pages:
-            if self._is_timeout_reached():
-                logger.warning("Global timeout reached, stopping extraction")
-                break
-                
-            contact_emails = self.http_handler.extract_emails_from_page(contact_url)
-            self._add_emails(contact_emails)
-            
+        # Step 3: Extract emails from contact pages using HTTP (the pages the crawler
+        # fetched are reused, the others are fetched concurrently over the shared
+        # client, and the first page with emails wins)
+        if contact_pages and self._is_timeout_reached():
+            logger.warning("Global timeout reached, stopping extraction")
+        elif contact_pages:
             # If we found emails, we can stop - no need for Playwright
-            if self.extracted_emails:
+            if await self._extract_from_first_responder(self.http_handler.extract_emails_from_page, contact_pages):
                 logger.info(f"Found {len(self.extracted_emails)} emails on contact pages using HTTP")
                 return self.extracted_emails
         
@@ -109,25 +172,21 @@ class EmailExtractor:
             
             # Try homepage with Playwright
             homepage_emails_pw = await self.playwright_handler.extract_emails_from_page(normalized_url)
-            self._add_emails(homepage_emails_pw)
+            await self._add_emails(homepage_emails_pw)
             
             # If we found emails, we're done
             if self.extracted_emails:
                 logger.info(f"Found {len(self.extracted_emails)} emails on homepage using Playwright")
                 return self.extracted_emails
             
-            # Step 5: If still no emails, try contact pages with Playwright
+            # Step 5: If still no emails, try contact pages with Playwright (each page is
+            # extracted concurrently in a pooled browser context, and the first page with emails wins)
             logger.info("No emails found on homepage with Playwright, trying contact pages")
-            for contact_url in contact_pages:
-                if self._is_timeout_reached():
-                    logger.warning("Global timeout reached, stopping extraction")
-                    break
-                    
-                contact_emails_pw = await self.playwright_handler.extract_emails_from_page(contact_url)
-                self._add_emails(contact_emails_pw)
-                
+            if contact_pages and self._is_timeout_reached():
+                logger.warning("Global timeout reached, stopping extraction")
+            elif contact_pages:
                 # If we found emails, we can stop
-                if self.extracted_emails:
+                if await self._extract_from_first_responder(self.playwright_handler.extract_emails_from_page, contact_pages):
                     logger.info(f"Found {len(self.extracted_emails)} emails on contact pages using Playwright")
                     return self.extracted_emails
         
@@ -140,29 +199,122 @@ class EmailExtractor:
         logger.info(f"Extraction complete. Found {len(self.extracted_emails)} emails")
         return self.extracted_emails
     
-    def _add_emails(self, emails):
+    async def _extract_from_first_responder(self, extract, urls):
         """
-        Add emails to the extracted emails set after verifying MX records.
+        Extract emails from several pages concurrently, stopping at the first page that yields any.
+        
+        Pages are processed in the order they finish, and the requests still
+        in flight are cancelled as soon as a valid email has been added.
+        
+        Args:
+            extract: Coroutine function taking a URL and returning a list of emails
+            urls (list): The URLs to extract emails from
+            
+        Returns:
+            bool: True if any emails were added, False otherwise
+        """
+        async def extract_one(url):
+            try:
+                return await extract(url)
+            except Exception as e:
+                logger.error(f"Error extracting emails from {url}: {str(e)}")
+                return []
+        
+        tasks = [asyncio.create_task(extract_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                await self._add_emails(await next_done)
+                if self.extracted_emails:
+                    return True
+            return False
+        finally:
+            # Discard the pages that haven't finished yet, and wait for them to wind
+            # down, so their pages are closed and contexts returned to the pool
+            # before the next step (or the browser's cleanup) needs them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _verify_mx_record(self, domain):
+        """
+        Check a domain's MX records, without blocking the event loop.
+        
+        Definitive results are cached per domain across runs. Queries go through
+        a single shared aiodns resolver when aiodns is installed, and fall back
+        to dnspython in a worker thread otherwise.
         
+        Args:
+            domain (str): The domain to check
+            
+        Returns:
+            bool or None: True if the domain has valid MX records, False if it has
+                none, None if the lookup failed (e.g. timed out) so it is unknown
+        """
+        has_mx = _get_cached_mx_record(domain)
+        if has_mx is not None:
+            return has_mx
+        
+        if aiodns is None:
+            has_mx = await asyncio.to_thread(verify_mx_record, domain)
+        else:
+            if self._resolver is None:
+                self._resolver = aiodns.DNSResolver(timeout=MX_LOOKUP_TIMEOUT / 2, tries=2)
+            has_mx = await verify_mx_record_async(domain, self._resolver)
+        
+        # A failed lookup is not cached, so the domain is looked up again next time
+        # instead of its emails being judged by a transient DNS error for a day
+        if has_mx is not None:
+            _cache_mx_record(domain, has_mx)
+        return has_mx
+    
+    async def _add_emails(self, emails):
+        """
+        Add emails to the extracted emails set after verifying MX records.
+
+        Emails are deduplicated case-insensitively (the first spelling seen is
+        kept), each distinct domain is resolved once, and all lookups for a
+        batch run concurrently.
+
         Args:
             emails (list): List of emails to add
         """
         if not emails:
             return
-            
+
+        # Skip emails that are already in the set (or repeated in this batch),
+        # comparing their canonical lowercase form
+        new_emails = {}
         for email in emails:
-            # Skip if email is already in the set
-            if email in self.extracted_emails:
+            canonical = email.strip().lower()
+            if canonical not in self._canonical_emails and canonical not in new_emails:
+                new_emails[canonical] = email
+
+        if not VERIFY_MX_RECORDS:
+            # Add emails without MX verification
+            self.extracted_emails.update(new_emails.values())
+            self._canonical_emails.update(new_emails)
+            return
+
+        # Verify MX records once per domain
+        email_domains = {canonical: get_email_domain(canonical) for canonical in new_emails}
+        domains = [domain for domain in dict.fromkeys(email_domains.values()) if domain]
+        results = await asyncio.gather(*(self._verify_mx_record(domain) for domain in domains))
+        mx_results = dict(zip(domains, results))
+
+        for canonical, email in new_emails.items():
+            # Emails whose domain certainly has no MX records are skipped, and those
+            # whose lookup failed unless MX_ACCEPT_ON_LOOKUP_FAILURE is set
+            has_mx = mx_results.get(email_domains[canonical], False)
+            if has_mx is False:
+                logger.warning(f"Skipped email with invalid MX record: {email}")
+                continue
+            if has_mx is None and not MX_ACCEPT_ON_LOOKUP_FAILURE:
+                logger.warning(f"Skipped email whose MX records could not be checked: {email}")
                 continue
-                
-            # Verify MX records if enabled
-            if VERIFY_MX_RECORDS:
-                domain = get_email_domain(email)
-                if domain and verify_mx_record(domain):
-                    self.extracted_emails.add(email)
-                    logger.info(f"Added email with valid MX record: {email}")
-                else:
-                    logger.warning(f"Skipped email with invalid MX record: {email}")
+
+            self.extracted_emails.add(email)
+            self._canonical_emails.add(canonical)
+            if has_mx:
+                logger.info(f"Added email with valid MX record: {email}")
             else:
-                # Add email without MX verification
-                self.extracted_emails.add(email)
\ No newline at end of file
+                logger.info(f"Added email whose MX records could not be checked: {email}")
\ No newline at end of file
@@ -2,28 +2,77 @@
 HTTP request handler for the Email Extractor.
 """
 
-import requests
-from bs4 import BeautifulSoup, Comment
-import logging
-import time
+import asyncio
+import httpx
+from lxml import etree
 from tenacity import retry, stop_after_attempt, wait_exponential
-from urllib.parse import urljoin
 
-from email_extractor.config import HTTP_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_FACTOR
+# httpx decodes brotli responses only when one of these is installed
+try:
+    import brotlicffi as brotli
+except ImportError:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+from email_extractor.config import (
+    HTTP_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_FACTOR,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_MAX_CONCURRENT_REQUESTS
+)
 from email_extractor.utils import (
     get_random_user_agent, extract_emails_from_text, 
     normalize_url, is_likely_contact_page, decode_email_entities,
-    extract_obfuscated_emails_from_js, is_valid_email,
-    logger
+    decode_data_enc_email, is_valid_email, extract_emails_from_tree,
+    parse_html, get_text, EmailList, logger
 )
 
+# Brotli is only advertised when it can be decoded, as servers would otherwise
+# send bodies that come back as undecodable bytes
+_ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
 class HTTPHandler:
     """Handles HTTP requests and email extraction from HTML content."""
     
+    # Precompiled XPath queries, evaluated by libxml2 rather than in Python
+    _DATA_ENC_EMAIL_XPATH = etree.XPath('//*[@data-enc-email]')
+    # Email properties inside schema.org Person and Organization items (Method 20)
+    _SCHEMA_EMAIL_XPATH = etree.XPath(
+        "//*[contains(@itemtype, 'schema.org/Person') or contains(@itemtype, 'schema.org/Organization')]"
+        "//*[@itemprop='email']"
+    )
+    _LINK_XPATH = etree.XPath('//a[@href]')
+    
     def __init__(self):
-        """Initialize the HTTP handler with a session."""
-        self.session = requests.Session()
+        """Initialize the HTTP handler with a shared HTTP/2 client."""
+        # A single client is used for every request, so its connection pool is
+        # reused and concurrent requests to the same host are multiplexed over
+        # one HTTP/2 connection. Its headers (and user agent) are set once, and
+        # stay the same for every request of the session
+        self.client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+            headers=self._get_headers(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        # Caps the requests in flight, as the crawler and extractor fetch many pages at once
+        self._request_semaphore = asyncio.Semaphore(HTTP_MAX_CONCURRENT_REQUESTS)
         self.visited_urls = set()
+        # Pages fetched during the current run, as (response_text, tree) tuples keyed
+        # by URL, so a page the crawler fetched isn't downloaded again for extraction
+        self.fetched_pages = {}
+    
+    async def close(self):
+        """Close the HTTP client and its pooled connections."""
+        await self.client.aclose()
+    
+    def rotate_user_agent(self):
+        """Switch the client to a new random user agent for the following requests."""
+        self.client.headers['User-Agent'] = get_random_user_agent()
     
     def _get_headers(self):
         """Get request headers with a random user agent."""
@@ -31,8 +80,7 @@ class HTTPHandler:
             'User-Agent': get_random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0',
         }
@@ -42,30 +90,36 @@ class HTTPHandler:
         wait=wait_exponential(multiplier=RETRY_BACKOFF_FACTOR, min=1, max=10),
         reraise=True
     )
-    def fetch_url(self, url):
+    async def fetch_url(self, url, track_visit=True):
         """
         Fetch a URL with retry logic.
         
+        Pages already fetched during the current run are returned from
+        fetched_pages, without another request.
+        
         Args:
             url (str): The URL to fetch
+            track_visit (bool): Record the URL as visited, so later requests for it are skipped
+                (unless the page was fetched, as it is then served from fetched_pages)
             
         Returns:
-            tuple: (response_text, soup) or (None, None) if failed
+            tuple: (response_text, tree) or (None, None) if failed
         """
-        if url in self.visited_urls:
+        page = self.fetched_pages.get(url)
+        if page is not None:
+            return page
+        
+        if track_visit and url in self.visited_urls:
             logger.debug(f"Skipping already visited URL: {url}")
             return None, None
         
-        self.visited_urls.add(url)
+        if track_visit:
+            self.visited_urls.add(url)
         
         try:
             logger.info(f"Fetching URL: {url}")
-            response = self.session.get(
-                url,
-                headers=self._get_headers(),
-                timeout=HTTP_TIMEOUT,
-                allow_redirects=True
-            )
+            async with self._request_semaphore:
+                response = await self.client.get(url)
             
             # Check if the request was successful
             if response.status_code != 200:
@@ -78,18 +132,23 @@ class HTTPHandler:
                 logger.warning(f"Skipping non-HTML content: {content_type} for {url}")
                 return None, None
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'lxml')
-            return response.text, soup
+            # Parse the raw body in the response's encoding, so lxml decodes it
+            # directly; the text is decoded once, for the regex-based methods
+            tree = parse_html(response.content, response.encoding)
+            if tree is None:
+                logger.warning(f"Empty document for {url}")
+                return None, None
+            page = self.fetched_pages[url] = (response.text, tree)
+            return page
             
-        except requests.RequestException as e:
+        except httpx.RequestError as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             raise  # Let retry handle this
         except Exception as e:
             logger.error(f"Unexpected error fetching {url}: {str(e)}")
             return None, None
     
-    def extract_emails_from_page(self, url):
+    async def extract_emails_from_page(self, url):
         """
         Extract emails from a web page.
         
@@ -99,343 +158,59 @@ class HTTPHandler:
         Returns:
             list: List of extracted email addresses
         """
-        html_text, soup = self.fetch_url(url)
-        if not html_text or not soup:
+        html_text, tree = await self.fetch_url(url)
+        if not html_text or tree is None:
             return []
         
-        emails = []
+        emails = EmailList()
         
         # Method 1: Extract from raw HTML (catches obfuscated emails)
         decoded_html = decode_email_entities(html_text)
         raw_emails = extract_emails_from_text(decoded_html)
         emails.extend(raw_emails)
         
-        # Method 2: Extract from visible text
-        if soup:
-            # Get all text from the page
-            visible_text = soup.get_text(" ", strip=True)
-            text_emails = extract_emails_from_text(visible_text)
-            emails.extend(text_emails)
-            
-            # Method 3: Check mailto links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('mailto:'):
-                    email = href[7:]  # Remove 'mailto:'
-                    # Handle additional parameters in mailto links
-                    if '?' in email:
-                        email = email.split('?')[0]
-                    if email and email not in emails:
-                        emails.append(email)
-            
-            # Method 3.1: Extract emails from text content of mailto links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('mailto:'):
-                    # Also check the text content of the link for emails
-                    link_text = link.get_text(strip=True)
-                    if link_text:
-                        text_emails = extract_emails_from_text(link_text)
-                        emails.extend(text_emails)
-            
-            # Method 4: Extract emails from JavaScript code
-            script_tags = soup.find_all('script')
-            for script in script_tags:
-                if script.string:
-                    js_emails = extract_obfuscated_emails_from_js(script.string)
-                    emails.extend(js_emails)
-            
-            # Method 5: Look for inline JavaScript in attributes
-            elements_with_js = soup.find_all(attrs={"onclick": True})
-            for element in elements_with_js:
-                js_emails = extract_obfuscated_emails_from_js(element['onclick'])
-                emails.extend(js_emails)
-            
-            # Method 6: Look for data attributes that might contain emails
-            elements_with_data = soup.find_all(lambda tag: any(attr.startswith('data-') for attr in tag.attrs))
-            for element in elements_with_data:
-                for attr, value in element.attrs.items():
-                    if attr.startswith('data-') and isinstance(value, str):
-                        data_emails = extract_emails_from_text(value)
-                        emails.extend(data_emails)
-            
-            # Method 7: Search for emails in attributes like title, alt, placeholder
-            for element in soup.find_all(attrs={"title": True}):
-                title_emails = extract_emails_from_text(element["title"])
-                emails.extend(title_emails)
-                
-            for element in soup.find_all("img", attrs={"alt": True}):
-                alt_emails = extract_emails_from_text(element["alt"])
-                emails.extend(alt_emails)
-                
-            for element in soup.find_all(attrs={"placeholder": True}):
-                placeholder_emails = extract_emails_from_text(element["placeholder"])
-                emails.extend(placeholder_emails)
-            
-            # Method 8: Extract and analyze HTML comments
-            comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-            for comment in comments:
-                comment_emails = extract_emails_from_text(comment)
-                emails.extend(comment_emails)
-            
-            # Method 9: Extract content from <noscript> tags
-            noscript_tags = soup.find_all('noscript')
-            for noscript in noscript_tags:
-                noscript_emails = extract_emails_from_text(noscript.get_text())
-                emails.extend(noscript_emails)
-                
-                # Also check for obfuscated emails in noscript content
-                if noscript.string:
-                    noscript_obfuscated_emails = extract_obfuscated_emails_from_js(noscript.string)
-                    emails.extend(noscript_obfuscated_emails)
-            
-            # Method 10: Check for non-standard attributes that might be used for obfuscation
-            for element in soup.find_all():
-                for attr, value in element.attrs.items():
-                    # Skip already processed attributes
-                    if attr in ['href', 'onclick', 'title', 'alt', 'placeholder'] or attr.startswith('data-'):
-                        continue
-                    
-                    if isinstance(value, str) and ('@' in value or '(at)' in value or '[at]' in value):
-                        attr_emails = extract_emails_from_text(value)
-                        emails.extend(attr_emails)
-            
-            # Method 11: Extract emails from meta tags
-            meta_tags = soup.find_all('meta')
-            for meta in meta_tags:
-                # Check content attribute
-                if meta.has_attr('content') and '@' in meta['content']:
-                    meta_emails = extract_emails_from_text(meta['content'])
-                    emails.extend(meta_emails)
-
-            # Method 12: Extract emails from structured data (JSON-LD)
-            json_ld_tags = soup.find_all('script', {'type': 'application/ld+json'})
-            for tag in json_ld_tags:
-                if tag.string:
-                    try:
-                        # Extract emails from the JSON-LD content
-                        json_ld_emails = extract_emails_from_text(tag.string)
-                        emails.extend(json_ld_emails)
-                    except Exception as e:
-                        logger.debug(f"Error parsing JSON-LD: {str(e)}")
-
-            # Method 13: Extract emails from form elements
-            form_elements = soup.find_all(['input', 'textarea'])
-            for element in form_elements:
-                # Check various attributes that might contain email hints
-                for attr in ['value', 'placeholder', 'name', 'id', 'aria-label']:
-                    if element.has_attr(attr) and '@' in element[attr]:
-                        form_emails = extract_emails_from_text(element[attr])
-                        emails.extend(form_emails)
-                
-                # Special case for email input fields
-                if element.name == 'input' and element.get('type') == 'email' and element.has_attr('value'):
-                    if is_valid_email(element['value']):
-                        emails.append(element['value'])
-
-            # Method 14: Extract emails from accessibility attributes
-            elements_with_aria = soup.find_all(lambda tag: any(attr.startswith('aria-') for attr in tag.attrs))
-            for element in elements_with_aria:
-                for attr, value in element.attrs.items():
-                    if attr.startswith('aria-') and isinstance(value, str) and '@' in value:
-                        aria_emails = extract_emails_from_text(value)
-                        emails.extend(aria_emails)
-
-            # Method 15: Extract emails from SVG elements and their attributes
-            svg_elements = soup.find_all('svg')
-            for svg in svg_elements:
-                # Get text content from SVG
-                svg_text = svg.get_text(strip=True)
-                svg_text_emails = extract_emails_from_text(svg_text)
-                emails.extend(svg_text_emails)
-                
-                # Check SVG element attributes
-                for element in svg.find_all():
-                    for attr, value in element.attrs.items():
-                        if isinstance(value, str) and '@' in value:
-                            svg_attr_emails = extract_emails_from_text(value)
-                            emails.extend(svg_attr_emails)
-
-            # Method 16: Extract emails from custom elements and web components
-            custom_elements = soup.find_all(lambda tag: '-' in tag.name)
-            for element in custom_elements:
-                # Get text content
-                custom_text = element.get_text(strip=True)
-                custom_text_emails = extract_emails_from_text(custom_text)
-                emails.extend(custom_text_emails)
-                
-                # Check attributes
-                for attr, value in element.attrs.items():
-                    if isinstance(value, str) and '@' in value:
-                        custom_attr_emails = extract_emails_from_text(value)
-                        emails.extend(custom_attr_emails)
-
-            # Method 17: Extract emails from microdata attributes
-            elements_with_microdata = soup.find_all(lambda tag: any(attr.startswith('itemp') for attr in tag.attrs))
-            for element in elements_with_microdata:
-                for attr, value in element.attrs.items():
-                    if attr in ['itemprop', 'itemtype'] and isinstance(value, str) and '@' in value:
-                        microdata_emails = extract_emails_from_text(value)
-                        emails.extend(microdata_emails)
-
-            # Method 18: Extract emails from source code comments (HTML)
-            # This is already covered by Method 8, but we'll add a more specific check for email patterns
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                if '@' in comment or '(at)' in comment or '[at]' in comment:
-                    comment_emails = extract_emails_from_text(comment)
-                    emails.extend(comment_emails)
-
-            # Method 19: Extract emails from iframe src attributes (sometimes used for contact forms)
-            iframe_elements = soup.find_all('iframe')
-            for iframe in iframe_elements:
-                if iframe.has_attr('src'):
-                    src = iframe['src']
-                    # Check for data: URIs that might contain emails
-                    if src.startswith('data:') and '@' in src:
-                        iframe_emails = extract_emails_from_text(src)
-                        emails.extend(iframe_emails)
-
-            # Method 20: Extract emails from schema.org markup
-            schema_elements = soup.find_all(attrs={"itemtype": True})
-            for element in schema_elements:
-                itemtype = element['itemtype']
-                if 'schema.org/Person' in itemtype or 'schema.org/Organization' in itemtype:
-                    # Find email properties
-                    email_props = element.find_all(attrs={"itemprop": "email"})
-                    for prop in email_props:
-                        if prop.has_attr('content'):
-                            if is_valid_email(prop['content']):
-                                emails.append(prop['content'])
-                        else:
-                            prop_text = prop.get_text(strip=True)
-                            if is_valid_email(prop_text):
-                                emails.append(prop_text)
-
-            # Method 21: Extract emails from <link> tags
-            link_elements = soup.find_all('link')
-            for link in link_elements:
-                # Check rel attribute for author or me
-                if link.has_attr('rel') and any(r in ['author', 'me'] for r in link['rel']):
-                    if link.has_attr('href'):
-                        href = link['href']
-                        # Check for mailto: links
-                        if href.startswith('mailto:'):
-                            email = href[7:]  # Remove 'mailto:'
-                            # Handle additional parameters in mailto links
-                            if '?' in email:
-                                email = email.split('?')[0]
-                            if email and is_valid_email(email):
-                                emails.append(email)
-                        # Check for regular URLs that might contain emails
-                        elif '@' in href:
-                            link_emails = extract_emails_from_text(href)
-                            emails.extend(link_emails)
-
-            # Method 22: Extract emails from <address> elements
-            address_elements = soup.find_all('address')
-            for address in address_elements:
-                # Get text content
-                address_text = address.get_text(strip=True)
-                address_emails = extract_emails_from_text(address_text)
-                emails.extend(address_emails)
-                
-                # Also check for mailto: links within address elements
-                for link in address.find_all('a', href=True):
-                    href = link['href']
-                    if href.startswith('mailto:'):
-                        email = href[7:]  # Remove 'mailto:'
-                        # Handle additional parameters in mailto links
-                        if '?' in email:
-                            email = email.split('?')[0]
-                        if email and is_valid_email(email):
-                            emails.append(email)
-
-            # Method 23: Extract emails from <pre> and <code> elements
-            code_elements = soup.find_all(['pre', 'code'])
-            for element in code_elements:
-                # Get text content
-                code_text = element.get_text(strip=True)
-                code_emails = extract_emails_from_text(code_text)
-                emails.extend(code_emails)
-
-            # Method 24: Extract emails from <style> tags (might contain emails in CSS comments)
-            style_elements = soup.find_all('style')
-            for style in style_elements:
-                if style.string:
-                    style_emails = extract_emails_from_text(style.string)
-                    emails.extend(style_emails)
-
-            # Method 25: Extract emails from <time> elements (sometimes used for contact timestamps)
-            time_elements = soup.find_all('time')
-            for time_el in time_elements:
-                # Check datetime attribute
-                if time_el.has_attr('datetime') and '@' in time_el['datetime']:
-                    time_emails = extract_emails_from_text(time_el['datetime'])
-                    emails.extend(time_emails)
-                
-                # Check text content
-                time_text = time_el.get_text(strip=True)
-                if '@' in time_text:
-                    text_emails = extract_emails_from_text(time_text)
-                    emails.extend(text_emails)
-
-            # Method 26: Extract emails from <output> elements (might contain dynamically generated emails)
-            output_elements = soup.find_all('output')
-            for output in output_elements:
-                output_text = output.get_text(strip=True)
-                output_emails = extract_emails_from_text(output_text)
-                emails.extend(output_emails)
-
-            # Method 27: Extract emails from <details> and <summary> elements
-            details_elements = soup.find_all(['details', 'summary'])
-            for element in details_elements:
-                details_text = element.get_text(strip=True)
-                details_emails = extract_emails_from_text(details_text)
-                emails.extend(details_emails)
-
-            # Method 29: Extract emails from <blockquote> and <cite> elements
-            quote_elements = soup.find_all(['blockquote', 'cite', 'q'])
-            for element in quote_elements:
-                quote_text = element.get_text(strip=True)
-                quote_emails = extract_emails_from_text(quote_text)
-                emails.extend(quote_emails)
-            
-            # Method 30: Extract emails from data-enc-email attributes
-            data_enc_emails = self._extract_emails_from_data_enc_email(soup)
-            emails.extend(data_enc_emails)
+        # Methods 2-29 (except 20): the visible text, comments and a single walk
+        # over the tree, shared with the Playwright handler
+        extract_emails_from_tree(tree, emails)
         
-        # Remove duplicates while preserving order
-        unique_emails = []
-        seen = set()
-        for email in emails:
-            if email not in seen:
-                seen.add(email)
-                unique_emails.append(email)
+        # Method 20: Extract emails from schema.org markup
+        for prop in self._SCHEMA_EMAIL_XPATH(tree):
+            content = prop.get('content')
+            if content is not None:
+                if is_valid_email(content):
+                    emails.append(content)
+            else:
+                prop_text = get_text(prop, strip=True)
+                if is_valid_email(prop_text):
+                    emails.append(prop_text)
+        
+        # Method 30: Extract emails from data-enc-email attributes
+        data_enc_emails = self._extract_emails_from_data_enc_email(tree)
+        emails.extend(data_enc_emails)
         
-        logger.info(f"Extracted {len(unique_emails)} emails from {url}")
-        return unique_emails
+        logger.info(f"Extracted {len(emails)} emails from {url}")
+        return list(emails)
     
-    def _extract_emails_from_data_enc_email(self, soup):
+    def _extract_emails_from_data_enc_email(self, tree):
         """
         Extract emails from data-enc-email attributes.
         
         Args:
-            soup (BeautifulSoup): The parsed HTML
+            tree (HtmlElement): The parsed HTML
             
         Returns:
             list: List of extracted email addresses
         """
-        if not soup:
+        if tree is None:
             return []
         
         emails = []
         
         # Find all elements with data-enc-email attribute
-        elements_with_data_enc_email = soup.find_all(attrs={"data-enc-email": True})
+        elements_with_data_enc_email = self._DATA_ENC_EMAIL_XPATH(tree)
         for element in elements_with_data_enc_email:
             encoded_email = element.get('data-enc-email')
             if encoded_email:
-                from email_extractor.utils import decode_data_enc_email
                 decoded_email = decode_data_enc_email(encoded_email)
                 if decoded_email:
                     emails.append(decoded_email)
@@ -443,26 +218,26 @@ class HTTPHandler:
         
         return emails
     
-    def find_contact_pages(self, base_url, soup):
+    def find_contact_pages(self, base_url, tree):
         """
-        Find potential contact pages from the given soup.
+        Find potential contact pages from the given tree.
         
         Args:
             base_url (str): The base URL
-            soup (BeautifulSoup): The parsed HTML
+            tree (HtmlElement): The parsed HTML
             
         Returns:
             list: List of contact page URLs sorted by relevance
         """
-        if not soup:
+        if tree is None:
             return []
         
         contact_links = []
         
         # Find all links
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            link_text = link.get_text(strip=True)
+        for link in self._LINK_XPATH(tree):
+            href = link.get('href')
+            link_text = get_text(link, strip=True)
             
             # Skip empty, javascript, and anchor links
             if not href or href.startswith(('javascript:', '#', 'tel:', 'mailto:')):
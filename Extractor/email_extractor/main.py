@@ -5,9 +5,9 @@ Main script for the Email Extractor.
 import asyncio
 import sys
 import signal
-import os
 import time
 from contextlib import asynccontextmanager
+from async_timeout import timeout
 
 from email_extractor.http_handler import HTTPHandler
 from email_extractor.playwright_handler import PlaywrightHandler
@@ -27,7 +27,7 @@ def signal_handler(sig, frame):
 
 @asynccontextmanager
 async def setup_extractor():
-    """Set up the email extractor components."""
+    """Set up the email extractor components, shared by every URL of the session."""
     global extractor, playwright_handler
     
     # Initialize HTTP handler
@@ -47,86 +47,108 @@ async def setup_extractor():
         yield extractor
     finally:
         # Clean up resources
+        await http_handler.close()
         if playwright_handler:
             await playwright_handler.cleanup()
 
-async def extract_emails_from_url(url):
+async def extract_emails_from_url(extractor, url, output_file):
     """
     Extract emails from a URL with a global timeout.
     
     Args:
+        extractor (EmailExtractor): The extractor set up by setup_extractor()
         url (str): The URL to extract emails from
+        output_file (file): The output file, open for appending
     """
-    async with setup_extractor() as extractor:
+    try:
+        # Run the extraction under a global timeout (no extra task is scheduled)
         try:
-            # Create a task with a global timeout
-            extraction_task = asyncio.create_task(extractor.extract_emails_from_url(url))
-            try:
-                emails = await asyncio.wait_for(extraction_task, timeout=GLOBAL_TIMEOUT)
+            async with timeout(GLOBAL_TIMEOUT):
+                emails = await extractor.extract_emails_from_url(url)
+            
+            # Save emails to output file (in one write, flushed so they are on
+            # disk even if the session is interrupted later)
+            if emails:
+                output_file.write(''.join(f"{email}\n" for email in emails))
+                output_file.flush()
                 
-                # Save emails to output file
-                if emails:
-                    with open(OUTPUT_FILE, 'a') as f:
-                        for email in emails:
-                            f.write(f"{email}\n")
-                    
-                    logger.info(f"Saved {len(emails)} emails to {OUTPUT_FILE}")
-                else:
-                    logger.warning(f"No emails found for {url}")
-            except asyncio.TimeoutError:
-                logger.error(f"Global timeout reached for {url}")
-                return
-        except Exception as e:
-            logger.error(f"Error extracting emails from {url}: {str(e)}")
+                logger.info(f"Saved {len(emails)} emails to {OUTPUT_FILE}")
+            else:
+                logger.warning(f"No emails found for {url}")
+        except asyncio.TimeoutError:
+            logger.error(f"Global timeout reached for {url}")
+            return
+    except Exception as e:
+        logger.error(f"Error extracting emails from {url}: {str(e)}")
+
+async def read_input(prompt):
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    Args:
+        prompt (str): The prompt to show
+        
+    Returns:
+        str: The line entered
+    """
+    return await asyncio.to_thread(input, prompt)
 
 async def main():
     """Main entry point for the Email Extractor."""
     # Set up signal handler for graceful exit
     signal.signal(signal.SIGINT, signal_handler)
     
-    # Create output file if it doesn't exist
-    if not os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, 'w') as f:
-            pass
-    
     logger.info("Email Extractor started")
     logger.info(f"Emails will be saved to {OUTPUT_FILE}")
     
-    # Main loop
-    while True:
-        try:
-            # Get URL from user
-            url = input("\nEnter a URL (or 'exit' to quit): ").strip()
-            
-            # Exit if requested
-            if url.lower() in ('exit', 'quit', 'q'):
-                break
-            
-            # Skip empty input
-            if not url:
-                continue
-            
-            # Create a task with a global timeout
-            start_time = time.time()
-            try:
-                # Extract emails with timeout protection
-                await extract_emails_from_url(url)
-                
-                # Log processing time
-                elapsed = time.time() - start_time
-                logger.info(f"Processing completed in {elapsed:.2f} seconds")
-            except asyncio.TimeoutError:
-                logger.error(f"Processing timed out after {GLOBAL_TIMEOUT} seconds")
-            except Exception as e:
-                logger.error(f"Error processing URL: {str(e)}")
-            
-        except KeyboardInterrupt:
-            break
-        except Exception as e:
-            logger.error(f"Error processing URL: {str(e)}")
+    # Launch the browser and open the HTTP client and output file (created if
+    # it doesn't exist) once, and reuse them for every URL
+    with open(OUTPUT_FILE, 'a') as output_file:
+        async with setup_extractor() as extractor:
+            # Main loop
+            while True:
+                try:
+                    # Get URL from user
+                    url = (await read_input("\nEnter a URL (or 'exit' to quit): ")).strip()
+                    
+                    # Exit if requested
+                    if url.lower() in ('exit', 'quit', 'q'):
+                        break
+                    
+                    # Skip empty input
+                    if not url:
+                        continue
+                    
+                    # Create a task with a global timeout
+                    start_time = time.time()
+                    try:
+                        # Extract emails with timeout protection
+                        await extract_emails_from_url(extractor, url, output_file)
+                        
+                        # Log processing time
+                        elapsed = time.time() - start_time
+                        logger.info(f"Processing completed in {elapsed:.2f} seconds")
+                    except asyncio.TimeoutError:
+                        logger.error(f"Processing timed out after {GLOBAL_TIMEOUT} seconds")
+                    except Exception as e:
+                        logger.error(f"Error processing URL: {str(e)}")
+                    
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"Error processing URL: {str(e)}")
     
     logger.info("Email Extractor finished")
 
+def run():
+    """Run the Email Extractor (the entry point of python -m email_extractor and run.py)."""
+    # Run the main function, on uvloop's libuv-based event loop if it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
+
 if __name__ == "__main__":
-    # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
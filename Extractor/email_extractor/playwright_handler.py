@@ -5,29 +5,319 @@ Playwright handler for the Email Extractor.
 import asyncio
 import re
 import time
-from playwright.async_api import async_playwright, TimeoutError
-from bs4 import BeautifulSoup, Comment
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from playwright.async_api import async_playwright
+from async_timeout import timeout
+from lxml import etree
 
 from email_extractor.config import (
     PLAYWRIGHT_TIMEOUT, HEADLESS, BROWSER_TYPE, 
-    SLOW_MO, ACCEPT_COOKIE_KEYWORDS, COOKIE_BANNER_TIMEOUT,
-    PAGE_NAVIGATION_TIMEOUT, CONTACT_PAGE_SEARCH_TIMEOUT
+    SLOW_MO, ACCEPT_COOKIE_PATTERN, COOKIE_BANNER_TIMEOUT,
+    PAGE_NAVIGATION_TIMEOUT, CONTACT_PAGE_SEARCH_TIMEOUT,
+    PLAYWRIGHT_CONTEXT_POOL_SIZE, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS,
+    PLAYWRIGHT_RESULT_CACHE_SIZE, PLAYWRIGHT_RESULT_CACHE_TTL
 )
 from email_extractor.utils import (
     get_random_user_agent, extract_emails_from_text, 
     normalize_url, is_likely_contact_page, decode_email_entities,
-    extract_obfuscated_emails_from_js, is_valid_email,
-    logger
+    extract_obfuscated_emails_from_js, decode_data_enc_email, extract_emails_from_tree,
+    parse_html, get_text, get_string, EmailList, EMAIL_REGEX, logger
 )
 
+def _result_cache_key(url):
+    """
+    Get the key a page's extraction result is cached under.
+    
+    Tracking parameters (utm_*, fbclid, gclid) are dropped, so links that only
+    differ in them share one entry.
+    
+    Args:
+        url (str): The page URL
+        
+    Returns:
+        tuple: (scheme, host, path, query)
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        query = urlencode([(name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                           if not name.startswith('utm_') and name not in ('fbclid', 'gclid')])
+    return parts.scheme, parts.netloc.lower(), parts.path or '/', query
+
+# Matches a URL whose host is, or is a subdomain of, one of BLOCKED_URL_PATTERNS,
+# so the route filter checks every host with a single regex search
+_BLOCKED_URL_RE = re.compile(
+    r'^[a-z][a-z0-9+.-]*://(?:[^/?#@]*@)?(?:[^/?#:]*\.)?(?:'
+    + '|'.join(re.escape(pattern) for pattern in BLOCKED_URL_PATTERNS)
+    + r')(?:[:/?#]|$)',
+    re.IGNORECASE
+) if BLOCKED_URL_PATTERNS else None
+
+# In-page part of Methods 12-15, 26-28, 30 and 39-41, run in a single evaluate
+# call instead of one round trip per method. It takes EMAIL_REGEX as its argument,
+# so the page matches emails with the same pattern as the Python side
+_PAGE_EXTRACTION_JS = '''
+    (emailPattern) => {
+        const emailRegex = new RegExp(emailPattern, 'g');
+        const results = {
+            jsContent: '',
+            attrEmails: [],
+            noscriptEmails: [],
+            commentEmails: [],
+            cssEmails: [],
+            canvasEmails: [],
+            shadowEmails: [],
+            storageEmails: [],
+            animationEmails: [],
+            wcEmails: [],
+            dataEncEmails: []
+        };
+        
+        // Characters an email's local part is made of
+        const addressChar = /[a-zA-Z0-9._%+-]/;
+        
+        function collect(text, found) {
+            for (const match of text.matchAll(emailRegex)) {
+                // A match right after an address character is the tail of a local
+                // part longer than the pattern allows, not an email in the page
+                if (match.index > 0 && addressChar.test(text[match.index - 1])) continue;
+                found.push(match[0]);
+            }
+        }
+        
+        // Method 12: Extract all JavaScript from the page
+        const scripts = Array.from(document.getElementsByTagName('script'));
+        results.jsContent = scripts.map(script => script.textContent || '').join('\\n');
+        
+        // Method 13: Check title, alt, placeholder attributes
+        const elementsWithAttrs = document.querySelectorAll('[title], [alt], [placeholder]');
+        for (const el of elementsWithAttrs) {
+            if (el.title) collect(el.title, results.attrEmails);
+            if (el.alt) collect(el.alt, results.attrEmails);
+            if (el.placeholder) collect(el.placeholder, results.attrEmails);
+        }
+        
+        // Method 13: Check every attribute that might contain an email, selected by
+        // the browser's XPath engine rather than visiting each element's attributes
+        const attrs = document.evaluate(
+            "//@*[contains(., '@') or contains(., '(at)') or contains(., '[at]')]",
+            document,
+            null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE,
+            null
+        );
+        for (let i = 0; i < attrs.snapshotLength; i++) {
+            const attr = attrs.snapshotItem(i);
+            if (['href', 'src', 'onclick', 'title', 'alt', 'placeholder'].includes(attr.name)) continue;
+            collect(attr.value, results.attrEmails);
+        }
+        
+        // Method 14: Extract content from noscript tags
+        for (const tag of document.querySelectorAll('noscript')) {
+            collect(tag.textContent, results.noscriptEmails);
+        }
+        
+        // Method 15: Extract emails from HTML comments
+        const iterator = document.createNodeIterator(
+            document.documentElement,
+            NodeFilter.SHOW_COMMENT,
+            null,
+            false
+        );
+        let node;
+        while (node = iterator.nextNode()) {
+            collect(node.nodeValue, results.commentEmails);
+        }
+        
+        // Method 26: Extract emails from CSS content properties
+        try {
+            for (const sheet of Array.from(document.styleSheets)) {
+                try {
+                    // Skip cross-origin stylesheets
+                    if (sheet.href && new URL(sheet.href).origin !== window.location.origin) {
+                        continue;
+                    }
+                    
+                    // Check for content property in the rules
+                    for (const rule of Array.from(sheet.cssRules || [])) {
+                        if (rule.style && rule.style.content) {
+                            collect(rule.style.content, results.cssEmails);
+                        }
+                    }
+                } catch (e) {
+                    // Skip stylesheets that can't be accessed due to CORS
+                    continue;
+                }
+            }
+        } catch (e) {
+            // Ignore errors
+        }
+        
+        // Method 27: Extract emails from canvas elements
+        try {
+            for (const canvas of document.querySelectorAll('canvas')) {
+                try {
+                    // Check if the canvas data contains email-like patterns
+                    const context = canvas.getContext('2d');
+                    collect(canvas.toDataURL(), results.canvasEmails);
+                } catch (e) {
+                    // Skip canvases that can't be accessed
+                    continue;
+                }
+            }
+        } catch (e) {
+            // Ignore errors
+        }
+        
+        // Method 28: Extract emails from shadow DOM
+        function extractFromShadowDOM(root) {
+            // Skip if not an element
+            if (!root || !root.querySelectorAll) return;
+            
+            collect(root.innerText || '', results.shadowEmails);
+            
+            // Check all elements with shadow roots
+            for (const el of root.querySelectorAll('*')) {
+                if (el.shadowRoot) {
+                    extractFromShadowDOM(el.shadowRoot);
+                }
+            }
+        }
+        
+        // Methods 28 and 40 share one walk over the page's elements, which a
+        // TreeWalker visits one by one without building an array of all of them
+        try {
+            const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+            for (let el = walker.currentNode; el; el = walker.nextNode()) {
+                if (el.shadowRoot) {
+                    try {
+                        extractFromShadowDOM(el.shadowRoot);
+                    } catch (e) {
+                        // Ignore errors
+                    }
+                }
+                
+                // Method 40: Extract emails from Web Components' Shadow DOM
+                // Custom elements are those with a dash in the name
+                if (!el.tagName.includes('-') || el.tagName === 'META-INF') continue;
+                
+                // Check text content
+                if (el.textContent) {
+                    collect(el.textContent, results.wcEmails);
+                }
+                
+                // Check shadow DOM if available
+                if (el.shadowRoot) {
+                    collect(el.shadowRoot.textContent || '', results.wcEmails);
+                }
+            }
+        } catch (e) {
+            // Ignore errors
+        }
+        
+        // Method 30: Extract emails from web storage (localStorage and sessionStorage)
+        try {
+            for (const storage of [localStorage, sessionStorage]) {
+                for (let i = 0; i < storage.length; i++) {
+                    const value = storage.getItem(storage.key(i));
+                    if (typeof value === 'string') {
+                        collect(value, results.storageEmails);
+                    }
+                }
+            }
+        } catch (e) {
+            // Ignore storage access errors
+        }
+        
+        // Method 39: Extract emails from JavaScript-based animations
+        try {
+            // Check for GSAP animations
+            if (window.gsap || window.TweenMax || window.TweenLite) {
+                const tweens = window.gsap ? window.gsap.getTweens() : 
+                            (window.TweenMax ? window.TweenMax.getAllTweens() : []);
+                
+                for (const tween of tweens) {
+                    if (tween.target && tween.target.textContent) {
+                        collect(tween.target.textContent, results.animationEmails);
+                    }
+                }
+            }
+            
+            // Check for CSS animations
+            const animatedElements = document.querySelectorAll('[class*="anim"]');  // Also matches "animate"
+            for (const el of animatedElements) {
+                if (el.textContent) {
+                    collect(el.textContent, results.animationEmails);
+                }
+            }
+        } catch (e) {
+            // Ignore errors
+        }
+        
+        // Method 41: Collect data-enc-email attributes, decoded on the Python side
+        for (const el of document.querySelectorAll('[data-enc-email]')) {
+            const encoded = el.getAttribute('data-enc-email');
+            if (encoded) results.dataEncEmails.push(encoded);
+        }
+        
+        return results;
+    }
+'''
+
+# Method 29: scrolls to the bottom of the page, waits for lazily loaded content
+# (until the DOM settles after changing, or at most the given number of
+# milliseconds), and returns the updated page text
+_SCROLL_AND_READ_JS = '''
+    async (delay) => {
+        window.scrollTo(0, document.body.scrollHeight);
+        await new Promise(resolve => {
+            let settle = null;
+            const finish = () => {
+                observer.disconnect();
+                clearTimeout(settle);
+                clearTimeout(limit);
+                resolve();
+            };
+            // Content is taken as loaded 100 ms after the last change
+            const observer = new MutationObserver(() => {
+                clearTimeout(settle);
+                settle = setTimeout(finish, 100);
+            });
+            observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+            const limit = setTimeout(finish, delay);
+        });
+        return document.body.innerText;
+    }
+'''
+
 class PlaywrightHandler:
     """Handles browser automation using Playwright."""
     
+    # Elements whose text contains any accept keyword are matched with one
+    # precompiled regex, instead of one selector per keyword and casing
+    _COOKIE_TEXT_SELECTORS = ("button:visible", "a:visible", "div:visible")
+    
+    # Buttons inside common consent containers (independent of the keywords)
+    _COOKIE_CONTAINER_SELECTORS = (
+        "[id*='cookie'] button:visible",
+        "[class*='cookie'] button:visible",
+        "[id*='consent'] button:visible",
+        "[class*='consent'] button:visible",
+        "[id*='gdpr'] button:visible",
+        "[class*='gdpr'] button:visible"
+    )
+    
+    # Precompiled XPath query, evaluated by libxml2 rather than in Python
+    _SCRIPT_XPATH = etree.XPath('//script')
+    
     def __init__(self):
         """Initialize the Playwright handler."""
         self.browser = None
-        self.context = None
-        self.page = None
+        self._context_pool = None  # Contexts pages are opened in, set up with the browser
+        self._result_cache = OrderedDict()  # Cache key -> (expiry timestamp, emails), least recently used first
+        self._cookie_banners_handled = set()  # (context, (scheme, netloc)) pairs whose cookie banner was handled
         self.visited_urls = set()
     
     async def __aenter__(self):
@@ -58,22 +348,11 @@ class PlaywrightHandler:
                 slow_mo=SLOW_MO
             )
             
-            # Create a context with custom user agent
-            self.context = await self.browser.new_context(
-                user_agent=get_random_user_agent(),
-                viewport={'width': 1280, 'height': 800},
-                java_script_enabled=True,
-                ignore_https_errors=True
-            )
-            
-            # Set default timeout
-            self.context.set_default_timeout(PLAYWRIGHT_TIMEOUT * 1000)  # Convert to ms
-            
-            # Create a page
-            self.page = await self.context.new_page()
-            
-            # Set up event handlers
-            self.page.on("dialog", self._handle_dialog)
+            # Pre-create a pool of contexts, so several pages can be loaded concurrently
+            # without paying the context startup cost for each one
+            self._context_pool = asyncio.Queue()
+            for _ in range(PLAYWRIGHT_CONTEXT_POOL_SIZE):
+                self._context_pool.put_nowait(await self._new_context())
             
             logger.info("Playwright browser setup complete")
             return True
@@ -83,18 +362,83 @@ class PlaywrightHandler:
             await self.cleanup()
             return False
     
+    async def _new_context(self):
+        """Create a browser context with a custom user agent."""
+        context = await self.browser.new_context(
+            user_agent=get_random_user_agent(),
+            viewport={'width': 1280, 'height': 800},
+            java_script_enabled=True,
+            ignore_https_errors=True
+        )
+        
+        # Set default timeout
+        context.set_default_timeout(PLAYWRIGHT_TIMEOUT * 1000)  # Convert to ms
+        
+        # Skip downloading resources that hold no emails, for every page of the context
+        if BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERNS:
+            await context.route("**/*", self._route_filter)
+        return context
+    
+    async def _route_filter(self, route):
+        """Abort requests for blocked resource types or blocked hosts, and let the others through."""
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or (_BLOCKED_URL_RE is not None and _BLOCKED_URL_RE.match(request.url)):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    @asynccontextmanager
+    async def _checkout_page(self):
+        """
+        Check a context out of the pool and open a fresh page in it.
+        
+        The page is closed and the context returned to the pool on exit.
+        
+        Yields:
+            Page: The page to work with
+        """
+        if self._context_pool is None:
+            raise RuntimeError("Playwright browser is not set up")
+        
+        context = await self._context_pool.get()
+        page = None
+        try:
+            page = await context.new_page()
+            page.on("dialog", self._handle_dialog)
+            yield page
+        finally:
+            # Return the context even if closing the page fails (e.g. it crashed),
+            # or the pool would run dry and every later checkout would block
+            try:
+                if page:
+                    await page.close()
+            except Exception as e:
+                logger.debug(f"Error closing page: {str(e)}")
+            finally:
+                self._context_pool.put_nowait(context)
+    
     async def _handle_dialog(self, dialog):
         """Handle dialogs (alerts, confirms, prompts)."""
         logger.info(f"Dismissing dialog: {dialog.message}")
         await dialog.dismiss()
     
-    async def _handle_cookie_banners(self):
-        """Attempt to handle cookie consent banners with a timeout."""
+    async def _handle_cookie_banners(self, page):
+        """Attempt to handle cookie consent banners on a page with a timeout."""
+        # Consent is kept in the context's cookies, so once a banner's button has been
+        # clicked, the origin isn't handled again in the same context
+        key = (page.context, urlsplit(page.url)[:2])
+        if key in self._cookie_banners_handled:
+            return True
+        
         try:
-            # Set a timeout for cookie banner handling
-            cookie_task = asyncio.create_task(self._find_and_click_cookie_button())
+            # Set a timeout for cookie banner handling (run in place, no extra task)
             try:
-                await asyncio.wait_for(cookie_task, timeout=COOKIE_BANNER_TIMEOUT)
+                async with timeout(COOKIE_BANNER_TIMEOUT):
+                    clicked = await self._find_and_click_cookie_button(page)
+                # Without a click (e.g. the banner hadn't rendered yet), the origin
+                # is tried again on its next page
+                if clicked:
+                    self._cookie_banners_handled.add(key)
                 return True
             except asyncio.TimeoutError:
                 logger.debug("Cookie banner handling timed out")
@@ -103,69 +447,77 @@ class PlaywrightHandler:
             logger.warning(f"Error handling cookie banner: {str(e)}")
             return False
 
-    async def _find_and_click_cookie_button(self):
-        """Find and click cookie consent buttons."""
-        for keyword in ACCEPT_COOKIE_KEYWORDS:
-            # Try different selector strategies
-            selectors = [
-                f"button:has-text('{keyword}')",
-                f"button:has-text('{keyword.upper()}')",
-                f"button:has-text('{keyword.capitalize()}')",
-                f"a:has-text('{keyword}')",
-                f"div:has-text('{keyword}'):visible",
-                f"[id*='cookie'] button",
-                f"[class*='cookie'] button",
-                f"[id*='consent'] button",
-                f"[class*='consent'] button",
-                f"[id*='gdpr'] button",
-                f"[class*='gdpr'] button"
-            ]
-            
-            for selector in selectors:
+    async def _find_and_click_cookie_button(self, page):
+        """
+        Find and click cookie consent buttons.
+        
+        Returns:
+            bool: True if a consent button was clicked, False otherwise
+        """
+        candidates = [(selector, page.locator(selector, has_text=ACCEPT_COOKIE_PATTERN).first)
+                      for selector in self._COOKIE_TEXT_SELECTORS]
+        candidates += [(selector, page.locator(selector).first) for selector in self._COOKIE_CONTAINER_SELECTORS]
+
+        # Wait for any of the candidates at once, rather than up to a second for each in turn
+        pending = {asyncio.ensure_future(button.wait_for(state="visible", timeout=1000))
+                   for _, button in candidates}
+        found = False
+        try:
+            while pending and not found:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A wait that raised means its selector wasn't found
+                found = any(wait.exception() is None for wait in done)
+        finally:
+            for wait in pending:
+                wait.cancel()
+        if not found:
+            return False
+
+        # Click the first visible candidate, in order of preference
+        for selector, button in candidates:
+            try:
+                if not await button.is_visible():
+                    continue
+                await button.click()
+                logger.info(f"Clicked cookie consent button: {selector}")
+                # Go on as soon as the banner is gone, rather than after a fixed delay
                 try:
-                    # Reduced timeout for selector waiting and added state option
-                    button = await self.page.wait_for_selector(
-                        selector, 
-                        timeout=1000,
-                        state="visible"
-                    )
-                    if button:
-                        try:
-                            await button.click()
-                            logger.info(f"Clicked cookie consent button: {selector}")
-                            await self.page.wait_for_timeout(500)  # Reduced wait time
-                            return True
-                        except Exception as e:
-                            logger.debug(f"Failed to click {selector}: {str(e)}")
-                            continue
+                    await button.wait_for(state="hidden", timeout=500)
                 except Exception:
-                    # Silently continue if selector not found
-                    continue
-        
+                    pass
+                return True
+            except Exception as e:
+                logger.debug(f"Failed to click {selector}: {str(e)}")
+                continue
+
         return False
     
-    async def navigate_to_url(self, url):
+    async def navigate_to_url(self, url, page, track_visit=True):
         """
         Navigate to a URL using Playwright.
         
         Args:
             url (str): The URL to navigate to
+            page (Page): The page to navigate
+            track_visit (bool): Record the URL as visited, so later requests for it are skipped
             
         Returns:
-            tuple: (success, html_content, soup)
+            tuple: (success, html_content, tree)
         """
-        if url in self.visited_urls:
-            logger.debug(f"Skipping already visited URL: {url}")
-            return False, None, None
-        
-        self.visited_urls.add(url)
+        if track_visit:
+            # Compare normalized URLs, so links that only differ in their fragment match
+            visit_key = normalize_url(url)
+            if visit_key in self.visited_urls:
+                logger.debug(f"Skipping already visited URL: {url}")
+                return False, None, None
+            self.visited_urls.add(visit_key)
         
         try:
             # Navigate to the URL
             logger.info(f"Navigating to URL with Playwright: {url}")
             try:
                 # Changed from networkidle to domcontentloaded for faster loading
-                response = await self.page.goto(
+                response = await page.goto(
                     url, 
                     wait_until="domcontentloaded", 
                     timeout=PAGE_NAVIGATION_TIMEOUT * 1000
@@ -178,7 +530,7 @@ class PlaywrightHandler:
             if not response:
                 try:
                     # Check if we have any content
-                    html_content = await self.page.content()
+                    html_content = await page.content()
                     if not html_content or len(html_content) < 100:  # Very small content likely means error
                         logger.warning(f"No usable content from {url}")
                         return False, None, None
@@ -188,18 +540,29 @@ class PlaywrightHandler:
             elif not response.ok:
                 logger.warning(f"Failed to navigate to {url}, status: {response.status}")
                 return False, None, None
+            else:
+                # Check content type, so documents like PDFs skip the cookie banner and extraction
+                content_type = response.headers.get('content-type', '').lower()
+                if content_type and 'html' not in content_type:
+                    logger.warning(f"Skipping non-HTML content: {content_type} for {url}")
+                    return False, None, None
             
             # Handle cookie banners
-            await self._handle_cookie_banners()
+            await self._handle_cookie_banners(page)
             
             # Get the page content
             try:
-                html_content = await self.page.content()
+                html_content = await page.content()
                 
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'lxml')
+                # Parse with lxml, whose tree walks and queries run in C. libxml2
+                # releases the GIL while parsing, so this runs in a worker thread (a
+                # str is parsed with lxml's thread-local default parser)
+                tree = await asyncio.to_thread(parse_html, html_content)
+                if tree is None:
+                    logger.warning(f"Empty document for {url}")
+                    return False, None, None
                 
-                return True, html_content, soup
+                return True, html_content, tree
             except Exception as e:
                 logger.error(f"Error getting page content: {str(e)}")
                 return False, None, None
@@ -218,670 +581,227 @@ class PlaywrightHandler:
         Returns:
             list: List of extracted email addresses
         """
+        # Pages extracted recently are answered without navigating to them again
+        key = _result_cache_key(url)
+        entry = self._result_cache.get(key)
+        if entry is not None:
+            if entry[0] >= time.time():
+                self._result_cache.move_to_end(key)
+                logger.info(f"Using cached Playwright results for {url}")
+                return list(entry[1])
+            del self._result_cache[key]
+        
         try:
-            # Create a task with timeout
-            extraction_task = asyncio.create_task(self._extract_emails_impl(url))
-            try:
-                return await asyncio.wait_for(extraction_task, timeout=PLAYWRIGHT_TIMEOUT)
-            except asyncio.TimeoutError:
-                logger.warning(f"Email extraction timed out for {url}")
-                return []
+            # Run in place under a timeout scope (no extra task is scheduled), on a
+            # page of its own so extractions can run concurrently
+            async with self._checkout_page() as page:
+                try:
+                    async with timeout(PLAYWRIGHT_TIMEOUT):
+                        return await self._extract_emails_impl(url, page)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Email extraction timed out for {url}")
+                    return []
         except Exception as e:
             logger.error(f"Error in extract_emails_from_page: {str(e)}")
             return []
 
-    async def _extract_emails_impl(self, url):
+    async def _extract_emails_impl(self, url, page):
         """Implementation of email extraction with proper error handling."""
-        success, html_content, soup = await self.navigate_to_url(url)
+        success, html_content, tree = await self.navigate_to_url(url, page)
         if not success or not html_content:
             return []
         
-        emails = []
-        
-        # Method 1: Extract from raw HTML (catches obfuscated emails)
-        decoded_html = decode_email_entities(html_content)
-        raw_emails = extract_emails_from_text(decoded_html)
-        emails.extend(raw_emails)
-        
-        # Method 2: Extract from visible text
-        if soup:
-            # Get all text from the page
-            visible_text = soup.get_text(" ", strip=True)
-            text_emails = extract_emails_from_text(visible_text)
-            emails.extend(text_emails)
-            
-            # Method 3: Check mailto links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('mailto:'):
-                    email = href[7:]  # Remove 'mailto:'
-                    # Handle additional parameters in mailto links
-                    if '?' in email:
-                        email = email.split('?')[0]
-                    if email and email not in emails:
-                        emails.append(email)
-            
-            # Method 3.1: Extract emails from text content of mailto links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('mailto:'):
-                    # Also check the text content of the link for emails
-                    link_text = link.get_text(strip=True)
-                    if link_text:
-                        text_emails = extract_emails_from_text(link_text)
-                        emails.extend(text_emails)
-        
-            # Method 4: Extract emails from JavaScript code
-            script_tags = soup.find_all('script')
-            for script in script_tags:
-                if script.string:
-                    js_emails = extract_obfuscated_emails_from_js(script.string)
-                    emails.extend(js_emails)
-            
-            # Method 5: Look for inline JavaScript in attributes
-            elements_with_js = soup.find_all(attrs={"onclick": True})
-            for element in elements_with_js:
-                js_emails = extract_obfuscated_emails_from_js(element['onclick'])
-                emails.extend(js_emails)
-            
-            # Method 6: Look for data attributes that might contain emails
-            elements_with_data = soup.find_all(lambda tag: any(attr.startswith('data-') for attr in tag.attrs))
-            for element in elements_with_data:
-                for attr, value in element.attrs.items():
-                    if attr.startswith('data-') and isinstance(value, str):
-                        data_emails = extract_emails_from_text(value)
-                        emails.extend(data_emails)
-        
-            # Method 7: Search for emails in attributes like title, alt, placeholder
-            for element in soup.find_all(attrs={"title": True}):
-                title_emails = extract_emails_from_text(element["title"])
-                emails.extend(title_emails)
-                
-            for element in soup.find_all("img", attrs={"alt": True}):
-                alt_emails = extract_emails_from_text(element["alt"])
-                emails.extend(alt_emails)
-                
-            for element in soup.find_all(attrs={"placeholder": True}):
-                placeholder_emails = extract_emails_from_text(element["placeholder"])
-                emails.extend(placeholder_emails)
-            
-            # Method 8: Extract and analyze HTML comments
-            comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-            for comment in comments:
-                comment_emails = extract_emails_from_text(comment)
-                emails.extend(comment_emails)
-            
-            # Method 9: Extract content from <noscript> tags
-            noscript_tags = soup.find_all('noscript')
-            for noscript in noscript_tags:
-                noscript_emails = extract_emails_from_text(noscript.get_text())
-                emails.extend(noscript_emails)
-                
-                # Also check for obfuscated emails in noscript content
-                if noscript.string:
-                    noscript_obfuscated_emails = extract_obfuscated_emails_from_js(noscript.string)
-                    emails.extend(noscript_obfuscated_emails)
-            
-            # Method 10: Check for non-standard attributes that might be used for obfuscation
-            for element in soup.find_all():
-                for attr, value in element.attrs.items():
-                    # Skip already processed attributes
-                    if attr in ['href', 'onclick', 'title', 'alt', 'placeholder'] or attr.startswith('data-'):
-                        continue
-                    
-                    if isinstance(value, str) and ('@' in value or '(at)' in value or '[at]' in value):
-                        attr_emails = extract_emails_from_text(value)
-                        emails.extend(attr_emails)
-        
-        # Method 11: Execute JavaScript to find emails that might be generated dynamically
+        # The regex and tree scans hold the CPU for a while on large pages, so they run
+        # in a worker thread, keeping the event loop free for the other pages' traffic.
+        # Methods 12-15, 26-28, 30 and 39-41 execute JavaScript to find emails that
+        # might be generated dynamically, in a single round trip made meanwhile, so the
+        # browser's work overlaps the scans. Method 11 (the page's innerText) is covered
+        # by Method 2, as page.content() serializes the live DOM
+        emails, results = await asyncio.gather(
+            asyncio.to_thread(self._extract_emails_from_html, html_content, tree),
+            page.evaluate(_PAGE_EXTRACTION_JS, EMAIL_REGEX),
+            return_exceptions=True
+        )
+        if isinstance(emails, BaseException):
+            raise emails
+
+        # Whether every method ran, so the result can be cached
+        complete = False
         try:
-            # Get all text content from the page using JavaScript
-            js_text = await self.page.evaluate('''
-                () => {
-                    return document.body.innerText;
-                }
-            ''')
-            js_emails = extract_emails_from_text(js_text)
-            emails.extend(js_emails)
-            
-            # Method 12: Extract all JavaScript from the page and analyze it
-            js_content = await self.page.evaluate('''
-                () => {
-                    const scripts = Array.from(document.getElementsByTagName('script'));
-                    return scripts.map(script => script.textContent || '').join('\\n');
-                }
-            ''')
-            js_obfuscated_emails = extract_obfuscated_emails_from_js(js_content)
-            emails.extend(js_obfuscated_emails)
-            
-            # Method 13: Extract emails from attributes using JavaScript
-            attr_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const attrEmails = [];
-                    
-                    // Check title, alt, placeholder attributes
-                    const elementsWithAttrs = document.querySelectorAll('[title], [alt], [placeholder]');
-                    for (const el of elementsWithAttrs) {
-                        if (el.title) {
-                            const matches = el.title.match(emailRegex);
-                            if (matches) attrEmails.push(...matches);
-                        }
-                        if (el.alt) {
-                            const matches = el.alt.match(emailRegex);
-                            if (matches) attrEmails.push(...matches);
-                        }
-                        if (el.placeholder) {
-                            const matches = el.placeholder.match(emailRegex);
-                            if (matches) attrEmails.push(...matches);
-                        }
-                    }
-                    
-                    // Check all elements for any attribute that might contain an email
-                    const allElements = document.querySelectorAll('*');
-                    for (const el of allElements) {
-                        for (const attr of el.attributes) {
-                            if (['href', 'src', 'onclick', 'title', 'alt', 'placeholder'].includes(attr.name)) continue;
-                            if (attr.value.includes('@') || attr.value.includes('(at)') || attr.value.includes('[at]')) {
-                                const matches = attr.value.match(emailRegex);
-                                if (matches) attrEmails.push(...matches);
-                            }
-                        }
-                    }
-                    
-                    return attrEmails;
-                }
-            ''')
-            emails.extend(attr_emails)
-            
-            # Method 14: Extract content from noscript tags using JavaScript
-            noscript_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const noscriptEmails = [];
-                    
-                    const noscriptTags = document.querySelectorAll('noscript');
-                    for (const tag of noscriptTags) {
-                        const matches = tag.textContent.match(emailRegex);
-                        if (matches) noscriptEmails.push(...matches);
-                    }
-                    
-                    return noscriptEmails;
-                }
-            ''')
-            emails.extend(noscript_emails)
+            if isinstance(results, BaseException):
+                raise results
+            complete = True
+
+            # Method 12: All JavaScript of the page
+            emails.extend(extract_obfuscated_emails_from_js(results['jsContent']))
             
-            # Method 15: Extract emails from HTML comments using JavaScript
-            comment_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const commentEmails = [];
-                    
-                    // Get all nodes in the document
-                    const iterator = document.createNodeIterator(
-                        document.documentElement,
-                        NodeFilter.SHOW_COMMENT,
-                        null,
-                        false
-                    );
-                    
-                    let node;
-                    while (node = iterator.nextNode()) {
-                        const matches = node.nodeValue.match(emailRegex);
-                        if (matches) commentEmails.push(...matches);
-                    }
-                    
-                    return commentEmails;
-                }
-            ''')
-            emails.extend(comment_emails)
+            # Methods 13-15, 26-28, 30, 39 and 40: Emails matched in the page
+            for key in ('attrEmails', 'noscriptEmails', 'commentEmails', 'cssEmails', 'canvasEmails',
+                        'shadowEmails', 'storageEmails', 'animationEmails', 'wcEmails'):
+                emails.extend(results[key])
             
-            # Method 26: Extract emails from CSS content properties using JavaScript
-            css_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const cssEmails = [];
-                    
-                    try {
-                        // Get all stylesheets
-                        const styleSheets = Array.from(document.styleSheets);
-                        
-                        for (const sheet of styleSheets) {
-                            try {
-                                // Skip cross-origin stylesheets
-                                if (sheet.href && new URL(sheet.href).origin !== window.location.origin) {
-                                    continue;
-                                }
-                                
-                                // Get all CSS rules
-                                const rules = Array.from(sheet.cssRules || []);
-                                
-                                for (const rule of rules) {
-                                    // Check for content property in the rule
-                                    if (rule.style && rule.style.content) {
-                                        const content = rule.style.content;
-                                        const matches = content.match(emailRegex);
-                                        if (matches) cssEmails.push(...matches);
-                                    }
-                                }
-                            } catch (e) {
-                                // Skip stylesheets that can't be accessed due to CORS
-                                continue;
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                    
-                    return cssEmails;
-                }
-            ''')
-            emails.extend(css_emails)
-
-            # Method 27: Extract emails from canvas elements
-            canvas_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const canvasEmails = [];
-                    
-                    try {
-                        // Get all canvas elements
-                        const canvasElements = document.querySelectorAll('canvas');
-                        
-                        for (const canvas of canvasElements) {
-                            try {
-                                // Try to get canvas data
-                                const context = canvas.getContext('2d');
-                                const dataURL = canvas.toDataURL();
-                                
-                                // Check if dataURL contains email-like patterns
-                                const matches = dataURL.match(emailRegex);
-                                if (matches) canvasEmails.push(...matches);
-                            } catch (e) {
-                                // Skip canvases that can't be accessed
-                                continue;
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                    
-                    return canvasEmails;
-                }
-            ''')
-            emails.extend(canvas_emails)
-
-            # Method 28: Extract emails from shadow DOM
-            shadow_dom_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const shadowEmails = [];
-                    
-                    function extractFromShadowDOM(root) {
-                        // Skip if not an element
-                        if (!root || !root.querySelectorAll) return;
-                        
-                        // Get text content
-                        const text = root.innerText || '';
-                        const matches = text.match(emailRegex);
-                        if (matches) shadowEmails.push(...matches);
-                        
-                        // Check all elements with shadow roots
-                        const elementsWithShadow = root.querySelectorAll('*');
-                        for (const el of elementsWithShadow) {
-                            if (el.shadowRoot) {
-                                extractFromShadowDOM(el.shadowRoot);
-                            }
-                        }
-                    }
-                    
-                    try {
-                        // Start with document body
-                        const elementsWithShadow = document.querySelectorAll('*');
-                        for (const el of elementsWithShadow) {
-                            if (el.shadowRoot) {
-                                extractFromShadowDOM(el.shadowRoot);
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                    
-                    return shadowEmails;
-                }
-            ''')
-            emails.extend(shadow_dom_emails)
-
             # Method 29: Extract emails from dynamically loaded content by scrolling
             try:
-                # Scroll to bottom to trigger lazy loading
-                await self.page.evaluate('''
-                    () => {
-                        window.scrollTo(0, document.body.scrollHeight);
-                    }
-                ''')
-                await self.page.wait_for_timeout(500)  # Wait for content to load
-                
-                # Get updated content
-                updated_html = await self.page.content()
-                updated_soup = BeautifulSoup(updated_html, 'lxml')
+                # Scroll to bottom to trigger lazy loading, and read the updated text
+                # in the same call instead of serializing and re-parsing the page
+                updated_text = await page.evaluate(_SCROLL_AND_READ_JS, 500)  # Wait 500 ms for content to load
                 
                 # Extract emails from the updated content
-                updated_text = updated_soup.get_text(" ", strip=True)
                 updated_emails = extract_emails_from_text(updated_text)
                 emails.extend(updated_emails)
             except Exception as e:
                 logger.debug(f"Error extracting emails from scrolled content: {str(e)}")
+                complete = False
 
-            # Method 30: Extract emails from web storage (localStorage and sessionStorage)
-            storage_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const storageEmails = [];
-                    
-                    try {
-                        // Check localStorage
-                        for (let i = 0; i < localStorage.length; i++) {
-                            const key = localStorage.key(i);
-                            const value = localStorage.getItem(key);
-                            
-                            if (typeof value === 'string') {
-                                const matches = value.match(emailRegex);
-                                if (matches) storageEmails.push(...matches);
-                            }
-                        }
-                        
-                        // Check sessionStorage
-                        for (let i = 0; i < sessionStorage.length; i++) {
-                            const key = sessionStorage.key(i);
-                            const value = sessionStorage.getItem(key);
-                            
-                            if (typeof value === 'string') {
-                                const matches = value.match(emailRegex);
-                                if (matches) storageEmails.push(...matches);
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore storage access errors
-                    }
-                    
-                    return storageEmails;
-                }
-            ''')
-            emails.extend(storage_emails)
-            
-            # Method 31: Extract emails from <link> tags
-            link_elements = soup.find_all('link')
-            for link in link_elements:
-                # Check rel attribute for author or me
-                if link.has_attr('rel') and any(r in ['author', 'me'] for r in link['rel']):
-                    if link.has_attr('href'):
-                        href = link['href']
-                        # Check for mailto: links
-                        if href.startswith('mailto:'):
-                            email = href[7:]  # Remove 'mailto:'
-                            # Handle additional parameters in mailto links
-                            if '?' in email:
-                                email = email.split('?')[0]
-                            if email and is_valid_email(email):
-                                emails.append(email)
-                        # Check for regular URLs that might contain emails
-                        elif '@' in href:
-                            link_emails = extract_emails_from_text(href)
-                            emails.extend(link_emails)
-
-            # Method 32: Extract emails from <address> elements
-            address_elements = soup.find_all('address')
-            for address in address_elements:
-                # Get text content
-                address_text = address.get_text(strip=True)
-                address_emails = extract_emails_from_text(address_text)
-                emails.extend(address_emails)
-                
-                # Also check for mailto: links within address elements
-                for link in address.find_all('a', href=True):
-                    href = link['href']
-                    if href.startswith('mailto:'):
-                        email = href[7:]  # Remove 'mailto:'
-                        # Handle additional parameters in mailto links
-                        if '?' in email:
-                            email = email.split('?')[0]
-                        if email and is_valid_email(email):
-                            emails.append(email)
-
-            # Method 33: Extract emails from <pre> and <code> elements
-            code_elements = soup.find_all(['pre', 'code'])
-            for element in code_elements:
-                # Get text content
-                code_text = element.get_text(strip=True)
-                code_emails = extract_emails_from_text(code_text)
-                emails.extend(code_emails)
-
-            # Method 34: Extract emails from <style> tags (might contain emails in CSS comments)
-            style_elements = soup.find_all('style')
-            for style in style_elements:
-                if style.string:
-                    style_emails = extract_emails_from_text(style.string)
-                    emails.extend(style_emails)
-
-            # Method 35: Extract emails from <time> elements (sometimes used for contact timestamps)
-            time_elements = soup.find_all('time')
-            for time_el in time_elements:
-                # Check datetime attribute
-                if time_el.has_attr('datetime') and '@' in time_el['datetime']:
-                    time_emails = extract_emails_from_text(time_el['datetime'])
-                    emails.extend(time_emails)
-                
-                # Check text content
-                time_text = time_el.get_text(strip=True)
-                if '@' in time_text:
-                    text_emails = extract_emails_from_text(time_text)
-                    emails.extend(text_emails)
-
-            # Method 36: Extract emails from <output> elements (might contain dynamically generated emails)
-            output_elements = soup.find_all('output')
-            for output in output_elements:
-                output_text = output.get_text(strip=True)
-                output_emails = extract_emails_from_text(output_text)
-                emails.extend(output_emails)
-
-            # Method 37: Extract emails from <details> and <summary> elements
-            details_elements = soup.find_all(['details', 'summary'])
-            for element in details_elements:
-                details_text = element.get_text(strip=True)
-                details_emails = extract_emails_from_text(details_text)
-                emails.extend(details_emails)
-
-            # Method 38: Extract emails from <blockquote> and <cite> elements
-            quote_elements = soup.find_all(['blockquote', 'cite', 'q'])
-            for element in quote_elements:
-                quote_text = element.get_text(strip=True)
-                quote_emails = extract_emails_from_text(quote_text)
-                emails.extend(quote_emails)
-
-            # Method 39: Extract emails from JavaScript-based animations
-            animation_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const animationEmails = [];
-                    
-                    try {
-                        // Check for GSAP animations
-                        if (window.gsap || window.TweenMax || window.TweenLite) {
-                            const tweens = window.gsap ? window.gsap.getTweens() : 
-                                        (window.TweenMax ? window.TweenMax.getAllTweens() : []);
-                            
-                            for (const tween of tweens) {
-                                if (tween.target && tween.target.textContent) {
-                                    const matches = tween.target.textContent.match(emailRegex);
-                                    if (matches) animationEmails.push(...matches);
-                                }
-                            }
-                        }
-                        
-                        // Check for CSS animations
-                        const animatedElements = document.querySelectorAll('*[class*="animate"], *[class*="anim"]');
-                        for (const el of animatedElements) {
-                            if (el.textContent) {
-                                const matches = el.textContent.match(emailRegex);
-                                if (matches) animationEmails.push(...matches);
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                    
-                    return animationEmails;
-                }
-            ''')
-            emails.extend(animation_emails)
-
-            # Method 40: Extract emails from Web Components' Shadow DOM using JavaScript
-            web_component_emails = await self.page.evaluate('''
-                () => {
-                    const emailRegex = /[a-zA-Z0-9._%+\\-]+@[a-zA-Z0-9.\\-]+\\.[a-zA-Z]{2,}/g;
-                    const wcEmails = [];
-                    
-                    try {
-                        // Find all custom elements (those with a dash in the name)
-                        const customElements = Array.from(document.querySelectorAll('*')).filter(el => 
-                            el.tagName.includes('-') && el.tagName !== 'META-INF'
-                        );
-                        
-                        for (const el of customElements) {
-                            // Check text content
-                            if (el.textContent) {
-                                const matches = el.textContent.match(emailRegex);
-                                if (matches) wcEmails.push(...matches);
-                            }
-                            
-                            // Check shadow DOM if available
-                            if (el.shadowRoot) {
-                                const shadowText = el.shadowRoot.textContent || '';
-                                const shadowMatches = shadowText.match(emailRegex);
-                                if (shadowMatches) wcEmails.push(...shadowMatches);
-                            }
-                        }
-                    } catch (e) {
-                        // Ignore errors
-                    }
-                    
-                    return wcEmails;
-                }
-            ''')
-            emails.extend(web_component_emails)
-            
             # Method 41: Extract emails from data-enc-email attributes
-            data_enc_emails = await self._extract_emails_from_data_enc_email(soup)
+            data_enc_emails = self._extract_emails_from_data_enc_email(results['dataEncEmails'])
             emails.extend(data_enc_emails)
             
             # Method 16: Look for elements with onclick handlers that might reveal emails
             # Limit the number of elements to check to avoid long processing
-            email_elements = await self.page.query_selector_all('[onclick*="mail"], [onclick*="email"]')
-            for i, element in enumerate(email_elements):
-                if i >= 5:  # Limit to 5 elements to avoid long processing
+            email_elements = await page.query_selector_all('[onclick*="mail"], [onclick*="email"]')
+            # Read all the handlers' source in one call. A handler whose source already
+            # holds an email was covered by Method 5 from the tree, so only the others
+            # (like "show email" buttons that fetch or build it) are clicked
+            handlers = await page.evaluate(
+                "elements => elements.map(element => element.getAttribute('onclick'))", email_elements
+            ) if email_elements else []
+            # Page states already extracted from (at most 6, one per click and the
+            # initial page), so a click that returns the page to a state seen before,
+            # like closing the modal the previous click opened, skips the parse
+            seen_html = {html_content}
+            clicks = 0
+            for element, handler in zip(email_elements, handlers):
+                if clicks >= 5:  # Limit to 5 clicks to avoid long processing
                     break
+                if handler and extract_obfuscated_emails_from_js(handler):
+                    continue
+                clicks += 1
                 try:
                     await element.click()
-                    await self.page.wait_for_timeout(300)  # Reduced wait time
-                    
-                    # Get updated page content
-                    updated_html = await self.page.content()
-                    updated_soup = BeautifulSoup(updated_html, 'lxml')
+                    await page.wait_for_timeout(300)  # Reduced wait time
+
+                    # Get updated page content, and only parse it if the click led to a new state
+                    updated_html = await page.content()
+                    if updated_html in seen_html:
+                        continue
+                    seen_html.add(updated_html)
+                    updated_tree = await asyncio.to_thread(parse_html, updated_html)
+                    if updated_tree is None:
+                        continue
                     
                     # Extract emails from the updated content
-                    updated_text = updated_soup.get_text(" ", strip=True)
+                    updated_text = get_text(updated_tree, " ", strip=True)
                     updated_emails = extract_emails_from_text(updated_text)
                     emails.extend(updated_emails)
                     
                     # Also check for newly revealed JavaScript
-                    updated_scripts = updated_soup.find_all('script')
-                    for script in updated_scripts:
-                        if script.string:
-                            updated_js_emails = extract_obfuscated_emails_from_js(script.string)
+                    for script in self._SCRIPT_XPATH(updated_tree):
+                        script_text = get_string(script)
+                        if script_text:
+                            updated_js_emails = extract_obfuscated_emails_from_js(script_text)
                             emails.extend(updated_js_emails)
                 except:
                     continue
         except Exception as e:
             logger.warning(f"Error executing JavaScript for email extraction: {str(e)}")
+            complete = False
+        
+        logger.info(f"Extracted {len(emails)} emails from {url} using Playwright")
+        # Partial results aren't cached, so a revisit extracts from the page again
+        if complete:
+            self._cache_result(url, emails)
+        return list(emails)
+    
+    def _extract_emails_from_html(self, html_content, tree):
+        """
+        Extract emails from the page HTML and its parsed tree (Methods 1-10 and 31-38).
+        
+        Args:
+            html_content (str): The page HTML
+            tree (HtmlElement): The parsed HTML
+            
+        Returns:
+            EmailList: The extracted email addresses
+        """
+        emails = EmailList()
+        
+        # Method 1: Extract from raw HTML (catches obfuscated emails)
+        decoded_html = decode_email_entities(html_content)
+        raw_emails = extract_emails_from_text(decoded_html)
+        emails.extend(raw_emails)
         
-        # Remove duplicates while preserving order
-        unique_emails = []
-        seen = set()
-        for email in emails:
-            if email not in seen:
-                seen.add(email)
-                unique_emails.append(email)
+        # Methods 2-10 and 31-38: the visible text, comments and a single walk
+        # over the tree, shared with the HTTP handler
+        extract_emails_from_tree(tree, emails)
         
-        logger.info(f"Extracted {len(unique_emails)} emails from {url} using Playwright")
-        return unique_emails
+        return emails
     
-    async def _extract_emails_from_data_enc_email(self, soup):
+    def _cache_result(self, url, emails):
+        """Keep the emails extracted from a page for PLAYWRIGHT_RESULT_CACHE_TTL seconds."""
+        if PLAYWRIGHT_RESULT_CACHE_SIZE <= 0:
+            return
+        key = _result_cache_key(url)
+        self._result_cache[key] = (time.time() + PLAYWRIGHT_RESULT_CACHE_TTL, tuple(emails))
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > PLAYWRIGHT_RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def _extract_emails_from_data_enc_email(self, encoded_emails):
         """
         Extract emails from data-enc-email attributes.
         
         Args:
-            soup (BeautifulSoup): The parsed HTML
+            encoded_emails (list): data-enc-email values read from the live DOM by the page script
             
         Returns:
             list: List of extracted email addresses
         """
-        if not soup:
-            return []
-        
         emails = []
         
-        # Find all elements with data-enc-email attribute
-        elements_with_data_enc_email = soup.find_all(attrs={"data-enc-email": True})
-        for element in elements_with_data_enc_email:
-            encoded_email = element.get('data-enc-email')
-            if encoded_email:
-                from utils import decode_data_enc_email
-                decoded_email = decode_data_enc_email(encoded_email)
-                if decoded_email:
-                    emails.append(decoded_email)
-                    logger.info(f"Decoded email from data-enc-email attribute: {decoded_email}")
-        
-        # Also try to extract using JavaScript
-        try:
-            js_data_enc_emails = await self.page.evaluate('''
-                () => {
-                    const dataEncEmails = [];
-                    const elements = document.querySelectorAll('[data-enc-email]');
-                    for (const el of elements) {
-                        dataEncEmails.push(el.getAttribute('data-enc-email'));
-                    }
-                    return dataEncEmails;
-                }
-            ''')
-            
-            for encoded_email in js_data_enc_emails:
-                if encoded_email:
-                    from email_extractor.utils import decode_data_enc_email
-                    decoded_email = decode_data_enc_email(encoded_email)
-                    if decoded_email:
-                        emails.append(decoded_email)
-                        logger.info(f"Decoded email from data-enc-email attribute using JavaScript: {decoded_email}")
-        except Exception as e:
-            logger.debug(f"Error extracting data-enc-email attributes using JavaScript: {str(e)}")
+        # Decode each distinct value once
+        for encoded_email in dict.fromkeys(encoded_emails):
+            decoded_email = decode_data_enc_email(encoded_email)
+            if decoded_email:
+                emails.append(decoded_email)
+                logger.info(f"Decoded email from data-enc-email attribute: {decoded_email}")
         
         return emails
     
-    async def find_contact_pages(self, base_url):
+    async def find_contact_pages_from_url(self, url, base_url, track_visit=True):
         """
-        Find potential contact pages from the current page with timeout protection.
+        Navigate to a URL on a page of its own and find the contact pages it links to.
+        
+        Args:
+            url (str): The URL to navigate to
+            base_url (str): The base URL
+            track_visit (bool): Record the URL as visited, so later requests for it are skipped
+            
+        Returns:
+            list: List of contact page URLs sorted by relevance
+        """
+        async with self._checkout_page() as page:
+            success, html_content, tree = await self.navigate_to_url(url, page, track_visit=track_visit)
+            if not success:
+                return []
+            return await self.find_contact_pages(base_url, page)
+    
+    async def find_contact_pages(self, base_url, page):
+        """
+        Find potential contact pages from the given page with timeout protection.
         
         Args:
             base_url (str): The base URL
+            page (Page): The page to read the links from
             
         Returns:
             list: List of contact page URLs sorted by relevance
         """
         try:
-            # Create a task with timeout
-            contact_task = asyncio.create_task(self._find_contact_pages_impl(base_url))
+            # Run in place under a timeout scope (no extra task is scheduled)
             try:
-                return await asyncio.wait_for(contact_task, timeout=CONTACT_PAGE_SEARCH_TIMEOUT)
+                async with timeout(CONTACT_PAGE_SEARCH_TIMEOUT):
+                    return await self._find_contact_pages_impl(base_url, page)
             except asyncio.TimeoutError:
                 logger.warning(f"Contact page search timed out for {base_url}")
                 return []
@@ -889,18 +809,18 @@ class PlaywrightHandler:
             logger.error(f"Error in find_contact_pages: {str(e)}")
             return []
     
-    async def _find_contact_pages_impl(self, base_url):
+    async def _find_contact_pages_impl(self, base_url, page):
         """Implementation of contact page finding with proper error handling."""
         try:
-            # Get all links from the page
-            links = await self.page.query_selector_all('a[href]')
-            
+            # Get the href and text of all links on the page in a single round trip,
+            # rather than two per link
+            links = await page.locator('a[href]').evaluate_all(
+                "links => links.map(link => [link.getAttribute('href'), link.textContent])"
+            )
+
             contact_links = []
-            for link in links:
+            for href, link_text in links:
                 try:
-                    href = await link.get_attribute('href')
-                    link_text = await link.text_content()
-                    
                     # Skip empty, javascript, and anchor links
                     if not href or href.startswith(('javascript:', '#', 'tel:', 'mailto:')):
                         continue
@@ -938,13 +858,10 @@ class PlaywrightHandler:
     async def cleanup(self):
         """Clean up Playwright resources."""
         try:
-            if self.page:
-                await self.page.close()
-                self.page = None
-            
-            if self.context:
-                await self.context.close()
-                self.context = None
+            if self._context_pool:
+                while not self._context_pool.empty():
+                    await self._context_pool.get_nowait().close()
+                self._context_pool = None
             
             if self.browser:
                 await self.browser.close()
@@ -1,6 +1,9 @@
 """
 Entry point for the Email Extractor.
 Run this script with: python run.py
+
+From the directory above the package, python -m email_extractor runs the
+same entry point without changing the Python path.
 """
 
 import os
@@ -10,9 +13,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import and run the main function from the main module
-from email_extractor.main import main
-import asyncio
+from email_extractor.main import run
 
 if __name__ == "__main__":
-    # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
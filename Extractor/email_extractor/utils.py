@@ -8,8 +8,23 @@ import random
 import tldextract
 import base64
 import json
-from urllib.parse import urljoin, urlparse
-from email_extractor.config import USER_AGENTS
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import unescape
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+from lxml import etree, html as lxml_html
+from email_extractor.config import USER_AGENTS, MX_LOOKUP_TIMEOUT
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up logging
 logging.basicConfig(
@@ -17,9 +32,18 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('email_extractor')
+# httpx logs every request at INFO; the handler already logs the URLs it fetches
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
-# Email regex pattern - comprehensive pattern to catch various email formats
-EMAIL_REGEX = r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}'
+# Email regex pattern - comprehensive pattern to catch various email formats.
+# The local part is capped at 64 characters (the RFC 5321 limit), so on a long run
+# of address characters without an '@' each start position gives up after 64 steps;
+# uncapped, backtracking engines (re, and the browser's, which gets this pattern too)
+# rescan the run to its end from every position, taking quadratic time. On a longer
+# local part the pattern matches its last 64 characters, so callers drop matches
+# that follow an address character (see _is_email_match_start(); RE2 has no
+# lookbehind to do this in the pattern)
+EMAIL_REGEX = r'[a-zA-Z0-9._%+\-]{1,64}@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}'
 
 # Regex pattern for obfuscated emails - handles various obfuscation techniques
 OBFUSCATED_EMAIL_REGEX = r'[a-zA-Z0-9._%+\-]+\s*(?:\(at\)|\[at\]|<at>|\{at\}|\(a\)|\[a\]|<a>|\{a\}|at|\sat\s|\(et\)|\[et\]|<et>|\{et\})\s*[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}'
@@ -28,37 +52,58 @@ OBFUSCATED_EMAIL_REGEX = r'[a-zA-Z0-9._%+\-]+\s*(?:\(at\)|\[at\]|<at>|\{at\}|\(a
 JS_EMAIL_PARTS_REGEX = r'(?:\'|\")([a-zA-Z0-9._%+\-]+)(?:\'|\")\s*\+\s*(?:\'|\")(@|&#64;|&commat;)(?:\'|\")'
 JS_EMAIL_DOMAIN_REGEX = r'(?:\'|\")([a-zA-Z0-9.\-]+)(?:\'|\")\s*\+\s*(?:\'|\")(\.|&#46;|&period;)(?:\'|\")\s*\+\s*(?:\'|\")([a-zA-Z]{2,})(?:\'|\")'
 JS_VAR_ASSIGNMENT_REGEX = r'var\s+([a-zA-Z0-9_]+)\s*=\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")'
-JS_VAR_ADDITION_REGEX = r'([a-zA-Z0-9_]+)\s*=\s*\1\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")'
-JS_VAR_ADDITION_WITH_ENTITY_REGEX = r'([a-zA-Z0-9_]+)\s*=\s*\1\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")'
+JS_VAR_ADDITION_REGEX = r'(?<![a-zA-Z0-9_])([a-zA-Z0-9_]+)\s*=\s*\1\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")'
+JS_VAR_ADDITION_WITH_ENTITY_REGEX = r'(?<![a-zA-Z0-9_])([a-zA-Z0-9_]+)\s*=\s*\1\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")\s*\+\s*(?:\'|\")([^\'\"]+)(?:\'|\")'
+
+def _compile_linear(pattern):
+    """
+    Compile a pattern that scans whole pages with RE2 when it is installed.
+    
+    RE2 matches in linear time, where the backtracking re module can take
+    quadratic time on long runs of address characters. It has no lookaround
+    or backreferences, so only patterns without them are compiled with it.
+    
+    Args:
+        pattern (str): The regex pattern
+        
+    Returns:
+        The compiled pattern (with the re module's matching API)
+    """
+    if re2 is not None:
+        return re2.compile(pattern)
+    return re.compile(pattern)
+
+# Compiled forms of the patterns above. The text helpers run once per attribute,
+# comment and script of every page, so every pattern they use is compiled at import
+_EMAIL_RE = _compile_linear(EMAIL_REGEX)
+_JS_EMAIL_PARTS_RE = _compile_linear(JS_EMAIL_PARTS_REGEX)
+_JS_EMAIL_DOMAIN_RE = _compile_linear(JS_EMAIL_DOMAIN_REGEX)
+_JS_VAR_ASSIGNMENT_RE = _compile_linear(JS_VAR_ASSIGNMENT_REGEX)
+_JS_VAR_ADDITION_RE = re.compile(JS_VAR_ADDITION_REGEX)
+_JS_VAR_ADDITION_WITH_ENTITY_RE = re.compile(JS_VAR_ADDITION_WITH_ENTITY_REGEX)
+
+# Literal (lowercase) markers for the edge cases extract_edge_case_emails() looks for,
+# with the email each one yields
+_EDGE_CASE_MARKERS = {
+    # support(at)example.com style
+    'support(at)example.com': 'support@example.com',
+    # user(a)domain.com style
+    'user(a)domain.com': 'user@domain.com',
+    # standard@email.com
+    'standard@email.com': 'standard@email.com',
+    # obfuscated(at)email.com
+    'obfuscated(at)email.com': 'obfuscated@email.com',
+}
 
 def extract_edge_case_emails(text):
     """Extract emails from specific edge cases that other methods might miss."""
     if not text:
         return []
     
-    edge_case_emails = []
-    
-    # Direct pattern for support(at)example.com style
-    pattern1 = r'support\(at\)example\.com'
-    if re.search(pattern1, text, re.IGNORECASE):
-        edge_case_emails.append('support@example.com')
-    
-    # Direct pattern for user(a)domain.com style
-    pattern2 = r'user\(a\)domain\.com'
-    if re.search(pattern2, text, re.IGNORECASE):
-        edge_case_emails.append('user@domain.com')
-    
-    # Direct pattern for standard@email.com
-    pattern3 = r'standard@email\.com'
-    if re.search(pattern3, text, re.IGNORECASE):
-        edge_case_emails.append('standard@email.com')
-    
-    # Direct pattern for obfuscated(at)email.com
-    pattern4 = r'obfuscated\(at\)email\.com'
-    if re.search(pattern4, text, re.IGNORECASE):
-        edge_case_emails.append('obfuscated@email.com')
-    
-    return edge_case_emails
+    # The markers are literal, so the text is lowercased once and searched with
+    # plain substring tests instead of one case-insensitive regex scan per marker
+    text_lower = text.lower()
+    return [email for marker, email in _EDGE_CASE_MARKERS.items() if marker in text_lower]
 
 # Contact page keywords in multiple languages
 CONTACT_KEYWORDS = {
@@ -129,39 +174,184 @@ ALL_CONTACT_KEYWORDS = set()
 for lang_keywords in CONTACT_KEYWORDS.values():
     ALL_CONTACT_KEYWORDS.update(lang_keywords)
 
+# Lowercased contact keywords, and alternations matching any of them, so a
+# link is scored with a few regex searches instead of a loop per keyword
+_CONTACT_KEYWORDS_LOWER = frozenset(keyword.lower() for keyword in ALL_CONTACT_KEYWORDS)
+
+def _compile_keyword_alternation(prefix, keywords):
+    """Compile a pattern matching the prefix followed by any of the keywords."""
+    # Longest first, so the alternation doesn't depend on set iteration order
+    alternatives = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    return _compile_linear(prefix + '(?:' + '|'.join(map(re.escape, alternatives)) + ')')
+
+_CONTACT_KEYWORD_RE = _compile_keyword_alternation('', _CONTACT_KEYWORDS_LOWER)
+_CONTACT_KEYWORD_PATH_RE = _compile_keyword_alternation('/', _CONTACT_KEYWORDS_LOWER)
+_CONTACT_KEYWORD_DASHED_RE = _compile_keyword_alternation(
+    '', {keyword.replace(' ', '-') for keyword in _CONTACT_KEYWORDS_LOWER}
+)
+
+# Common contact page paths, without their leading slash. They are plain strings,
+# so a URL is matched by testing whether any of its path segments starts with one
+_CONTACT_URL_PREFIXES = tuple(path.lstrip('/') for path in [
+    '/contact', '/kontakt', '/contacto', '/contatti', '/contact-us',
+    '/about', '/about-us', '/ueber-uns', '/impressum', '/imprint',
+    '/get-in-touch', '/reach-us', '/reach-out', '/connect',
+    '/teave', '/yhteystiedot', '/kontakti', '/kontaktai',
+    '/kapcsolat', '/επικοινωνία', '/επικοινωνια', '/контакт', '/контакти',
+    '/teagmháil', '/teagmhail', '/kuntatt', '/cysylltu',
+    '/fios-thugainn', '/o-nas', '/o-nás', '/o-nama', '/par-mums',
+    '/apie-mus', '/despre-noi', '/rólunk', '/rolunk', '/meistä', '/meista',
+    '/om-oss', '/om-os', '/über-uns', '/chi-siamo', '/quienes-somos',
+    '/wie-zijn-wij', '/guri-buruz', '/amdanom-ni', '/mu-ar-deidhinn',
+    '/iwwer-eis', '/sobre-nosaltres', '/sobre-nós', '/sobre-nos'
+])
+
+# The path segment following a language code (/en/, /de/, /eng/, /en-US/, /en_GB/, etc.)
+_LANG_CODE_PATH_RE = re.compile(r'/[a-z]{2,3}(?:[-_][a-z]{2,3})?/([^/]+)')
+
+def _get_html_parser(encoding):
+    """Return an HTML parser for bytes in the given encoding, reused within the calling thread."""
+    # Parsers must not be used by two threads at once, and pages are parsed in worker threads too
+    return _get_thread_html_parser(encoding, threading.get_ident())
+
+@lru_cache(maxsize=None)
+def _get_thread_html_parser(encoding, thread_id):
+    """Return the HTML parser for bytes in the given encoding, for one thread."""
+    try:
+        return lxml_html.HTMLParser(encoding=encoding)
+    except LookupError:
+        # An encoding libxml2 doesn't know; let it detect one from the document
+        return None
+
+def parse_html(html_text, encoding=None):
+    """
+    Parse HTML into an lxml element tree.
+    
+    Args:
+        html_text (str or bytes): The HTML to parse
+        encoding (str): Encoding of html_text when it is bytes, or None to detect
+            it from the document
+        
+    Returns:
+        HtmlElement: The root element, or None if the document is empty
+    """
+    try:
+        if isinstance(html_text, bytes):
+            # libxml2 decodes the bytes itself, without a str round trip
+            parser = _get_html_parser(encoding) if encoding else None
+            return lxml_html.document_fromstring(html_text, parser=parser)
+        return lxml_html.document_fromstring(html_text)
+    except etree.ParserError:
+        return None
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml_html.document_fromstring(html_text.encode('utf-8'), parser=_get_html_parser('utf-8'))
+
+# Text nodes of an element, matching BeautifulSoup's get_text(): the contents of
+# script, style and template elements only count as text of the element itself
+_TEXT_XPATH = etree.XPath(
+    './/text()[not(ancestor::script or ancestor::style or ancestor::template)]', smart_strings=False
+)
+_TEMPLATE_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]', smart_strings=False)
+_ALL_TEXT_XPATH = etree.XPath('.//text()', smart_strings=False)
+
+def get_text(element, separator='', strip=False):
+    """
+    Get the text content of an element.
+    
+    Args:
+        element (HtmlElement): The element
+        separator (str): String placed between the text nodes
+        strip (bool): Strip each text node and drop the empty ones
+        
+    Returns:
+        str: The text content
+    """
+    tag = element.tag
+    if len(element) == 0:
+        # An element without children holds at most one text node (the common case
+        # for the inline tags the extraction methods read), so its text is returned
+        # without evaluating an XPath query or building a list
+        if tag in ('script', 'style', 'template') or next(element.iterancestors('template'), None) is None:
+            text = element.text or ''
+        else:
+            text = ''
+        return text.strip() if strip else text
+    
+    if tag in ('script', 'style'):
+        strings = _ALL_TEXT_XPATH(element)
+    elif tag == 'template':
+        strings = _TEMPLATE_TEXT_XPATH(element)
+    else:
+        strings = _TEXT_XPATH(element)
+    
+    if strip:
+        strings = [string.strip() for string in strings]
+        strings = [string for string in strings if string]
+    return separator.join(strings)
+
+def get_string(element):
+    """
+    Get the only string inside an element (like BeautifulSoup's Tag.string).
+    
+    Args:
+        element (HtmlElement): The element
+        
+    Returns:
+        str: The string, or None if the element has no or several children
+    """
+    while len(element) == 1 and not element.text and not element[0].tail:
+        element = element[0]
+        if not isinstance(element.tag, str):
+            # A lone comment
+            return element.text
+    
+    return element.text if len(element) == 0 else None
+
+# Attributes that BeautifulSoup splits into token lists; they hold no free text,
+# so the attribute scans skip them
+TOKEN_LIST_ATTRIBUTES = frozenset([
+    'class', 'accesskey', 'dropzone', 'rel', 'rev', 'headers',
+    'accept-charset', 'archive', 'sizes', 'sandbox'
+])
+
 def get_random_user_agent():
     """Return a random user agent from the configured list."""
     return random.choice(USER_AGENTS)
 
+# The crawler checks and normalizes the same URLs many times, so parses are cached.
+# ParseResult is an immutable namedtuple, which makes sharing it safe
+_urlparse = lru_cache(maxsize=4096)(urlparse)
+
 def is_valid_url(url):
     """Check if a URL is valid."""
     try:
-        result = urlparse(url)
+        result = _urlparse(url)
         return all([result.scheme, result.netloc])
     except:
         return False
 
+@lru_cache(maxsize=4096)
 def normalize_url(url, base_url=None):
-    """Normalize a URL by handling relative paths and removing fragments."""
+    """
+    Normalize a URL by handling relative paths and removing fragments.
+    
+    Results are cached, as the same links are normalized on every crawled page.
+    """
     if not url:
         return None
     
-    # Handle relative URLs
-    if base_url and not urlparse(url).netloc:
-        url = urljoin(base_url, url)
-    
-    # Parse the URL
-    parsed = urlparse(url)
+    # Parse the URL, and again once joined if it is relative
+    parsed = urlsplit(url)
+    if base_url and not parsed.netloc:
+        parsed = urlsplit(urljoin(base_url, url))
     
     # Reconstruct the URL without fragments
-    normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    if parsed.query:
-        normalized += f"?{parsed.query}"
-    
-    return normalized
+    return urlunsplit((parsed.scheme, parsed.netloc, parsed.path, parsed.query, ''))
 
+@lru_cache(maxsize=4096)
 def get_domain(url):
-    """Extract the domain from a URL."""
+    """Extract the domain from a URL (cached, as tldextract lookups are comparatively slow)."""
     extracted = tldextract.extract(url)
     return f"{extracted.domain}.{extracted.suffix}"
 
@@ -169,294 +359,250 @@ def is_same_domain(url1, url2):
     """Check if two URLs belong to the same domain."""
     return get_domain(url1) == get_domain(url2)
 
+@lru_cache(maxsize=4096)
 def is_likely_contact_page(url, link_text=None):
     """
     Determine if a URL is likely to be a contact page based on its URL and link text.
     Returns a score from 0-10 indicating likelihood (10 being highest).
+    
+    Scores are cached, as the same navigation links appear on every crawled page.
     """
-    score = 0
+    # Penalize very long URLs (likely not contact pages). The penalty is applied
+    # first, as every later check only adds to the score, so scoring can stop as
+    # soon as the score reaches the cap
+    score = -2 if len(url) > 100 else 0
     url_lower = url.lower()
     
     # Check URL path for contact keywords
-    for keyword in ALL_CONTACT_KEYWORDS:
-        keyword_lower = keyword.lower()
+    if _CONTACT_KEYWORD_PATH_RE.search(url_lower):
         # Exact match in path gets higher score
-        if f"/{keyword_lower}" in url_lower or f"/{keyword_lower}/" in url_lower:
-            score += 7
-            break
+        score += 7
+    elif _CONTACT_KEYWORD_RE.search(url_lower):
         # Partial match in URL
-        elif keyword_lower in url_lower:
-            score += 5
-            break
+        score += 5
     
     # If link text is provided, check it for contact keywords
     if link_text:
         link_text_lower = link_text.lower()
         
-        # Check for exact match in link text (case insensitive)
-        for keyword in ALL_CONTACT_KEYWORDS:
-            keyword_lower = keyword.lower()
-            # Exact match in link text gets higher score
-            if link_text_lower == keyword_lower:
-                score += 8
-                break
-            # Partial match in link text
-            elif keyword_lower in link_text_lower:
+        # Exact match in link text (case insensitive) gets higher score
+        if link_text_lower in _CONTACT_KEYWORDS_LOWER:
+            score += 8
+            in_link_text = True
+        # Partial match in link text
+        else:
+            in_link_text = _CONTACT_KEYWORD_RE.search(link_text_lower) is not None
+            if in_link_text:
                 score += 5
-                break
         
         # Special case: If link text is all uppercase and contains a contact keyword
         # This handles cases like "KONTAKT" in the example
-        if link_text.isupper():
-            for keyword in ALL_CONTACT_KEYWORDS:
-                if keyword.lower() in link_text.lower():
-                    score += 2  # Additional boost for uppercase contact keywords
-                    break
-    
-    # Check for common contact page patterns in URL
-    contact_patterns = [
-        r'/contact', r'/kontakt', r'/contacto', r'/contatti', r'/contact-us',
-        r'/about', r'/about-us', r'/ueber-uns', r'/impressum', r'/imprint',
-        r'/get-in-touch', r'/reach-us', r'/reach-out', r'/connect',
-        r'/teave', r'/yhteystiedot', r'/kontakti', r'/kontaktai',
-        r'/kapcsolat', r'/επικοινωνία', r'/επικοινωνια', r'/контакт', r'/контакти',
-        r'/teagmháil', r'/teagmhail', r'/kuntatt', r'/cysylltu',
-        r'/fios-thugainn', r'/o-nas', r'/o-nás', r'/o-nama', r'/par-mums',
-        r'/apie-mus', r'/despre-noi', r'/rólunk', r'/rolunk', r'/meistä', r'/meista',
-        r'/om-oss', r'/om-os', r'/über-uns', r'/chi-siamo', r'/quienes-somos',
-        r'/wie-zijn-wij', r'/guri-buruz', r'/amdanom-ni', r'/mu-ar-deidhinn',
-        r'/iwwer-eis', r'/sobre-nosaltres', r'/sobre-nós', r'/sobre-nos'
-    ]
+        if in_link_text and link_text.isupper():
+            score += 2  # Additional boost for uppercase contact keywords
+        
+        if score >= 10:
+            return 10
     
-    for pattern in contact_patterns:
-        if re.search(pattern, url_lower):
-            score += 3
-            break
+    # Check for common contact page patterns in URL (any text following a slash)
+    if any(segment.startswith(_CONTACT_URL_PREFIXES) for segment in url_lower.split('/')[1:]):
+        score += 3
+        if score >= 10:
+            return 10
     
     # Boost score for URLs with 'contact' or equivalent in the path
     if '/contact' in url_lower or '/kontakt' in url_lower or '/teave' in url_lower:
         score += 2
+        if score >= 10:
+            return 10
     
     # Check for URLs with language codes followed by contact keywords
     # This handles cases like "/index.php/en/teave", "/index.php/eng/teave", 
     # "/index.php/en-US/contact", or "/index.php/en_GB/contact"
-    lang_code_pattern = r'/(?:[a-z]{2,3}(?:[-_][a-z]{2,3})?)/'  # Matches /en/, /de/, /eng/, /en-US/, /en_GB/, etc.
-    if re.search(lang_code_pattern, url_lower):
-        # Extract the part after the language code
-        match = re.search(r'/[a-z]{2,3}(?:[-_][a-z]{2,3})?/([^/]+)', url_lower)
-        if match:
-            path_after_lang = match.group(1)
-            for keyword in ALL_CONTACT_KEYWORDS:
-                if keyword.lower() == path_after_lang:
-                    score += 6
-                    break
+    match = _LANG_CODE_PATH_RE.search(url_lower)
+    if match and match.group(1) in _CONTACT_KEYWORDS_LOWER:
+        score += 6
+        if score >= 10:
+            return 10
     
     # Boost score for URLs with any contact keyword in the path regardless of position
-    for keyword in ALL_CONTACT_KEYWORDS:
-        keyword_lower = keyword.lower().replace(' ', '-')  # Handle keywords with spaces as dashes
-        if keyword_lower in url_lower.replace('_', '-'):  # Normalize underscores to dashes
-            score += 1
-            break
-    
-    # Penalize very long URLs (likely not contact pages)
-    if len(url) > 100:
-        score -= 2
+    # (keywords with spaces are matched as dashes, and underscores are normalized to dashes)
+    if _CONTACT_KEYWORD_DASHED_RE.search(url_lower.replace('_', '-')):
+        score += 1
     
     return min(score, 10)  # Cap at 10
 
+# Obfuscated forms of the @ sign, all replaced by '@' in a single pass
+_DEOBFUSCATION_RE = re.compile(
+    r'\(at\)|\[at\]|<at>|\{at\}|\(a\)|\[a\]|<a>|\{a\}|\(et\)|\[et\]|<et>|\{et\}'
+    r'|\s+at\s+'  # 'person at domain'
+    r'|^at'  # 'at' at the beginning
+    r'|at$',  # 'at' at the end
+    re.IGNORECASE
+)
+
 def deobfuscate_email(email):
     """Convert obfuscated email to standard format."""
-    # Replace various obfuscation patterns with @
-    patterns = [
-        (r'\(at\)', '@'), 
-        (r'\[at\]', '@'), 
-        (r'<at>', '@'), 
-        (r'\{at\}', '@'),
-        (r'\(a\)', '@'), 
-        (r'\[a\]', '@'), 
-        (r'<a>', '@'), 
-        (r'\{a\}', '@'),
-        (r'\(et\)', '@'), 
-        (r'\[et\]', '@'), 
-        (r'<et>', '@'), 
-        (r'\{et\}', '@'),
-        (r'\s+at\s+', '@'),  # 'person at domain'
-        (r'^at', '@'),       # 'at' at the beginning
-        (r'at$', '@')        # 'at' at the end
-    ]
-    
-    result = email
-    for pattern, replacement in patterns:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+    result = _DEOBFUSCATION_RE.sub('@', email)
     
     # Remove any spaces that might have been introduced
     result = result.replace(' ', '')
     
     return result
 
+# Obfuscated forms of the @ sign, in the order their emails are reported in
+_OBFUSCATED_AT_SIGNS = ['(at)', '[at]', '<at>', '{at}', '(a)', '[a]', '<a>', '{a}', 'at', '(et)', '[et]', '<et>', '{et}']
+_OBFUSCATED_AT_SIGN_ORDER = {at_sign: index for index, at_sign in enumerate(_OBFUSCATED_AT_SIGNS)}
+
+# Obfuscated emails (username, @ sign and domain groups) with careful boundaries, for
+# every obfuscated @ sign at once, in any letter case; a plain "at" needs whitespace on
+# both sides. The domain may be followed by a sentence-ending period, but not by more
+# address characters, so that partial matches are avoided. The pattern is a lookahead,
+# so that an email whose username is the domain of the one before it is found as well
+_OBFUSCATED_EMAIL_RE = re.compile(
+    r'(?=(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)'
+    r'\s*(?i:(\(at\)|\[at\]|<at>|\{at\}|\(a\)|\[a\]|<a>|\{a\}|(?<=\s)at(?=\s)|\(et\)|\[et\]|<et>|\{et\}))\s*'
+    r'([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9_%+\-]|\.[a-zA-Z0-9._%+\-]))'
+)
+
+# Simple patterns for common obfuscations in the plain text of HTML content
+_SIMPLE_OBFUSCATION_PATTERNS = [_compile_linear(pattern) for pattern in [
+    r'([a-zA-Z0-9._%+\-]+)\s*\(at\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s*\[at\]\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s*<at>\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s*\{at\}\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s*\(a\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s+at\s+([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+    r'([a-zA-Z0-9._%+\-]+)\s*\(et\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
+]]
+
+# Markup dropped to get the text of HTML: comments, the contents of script, style and
+# template elements (which get_text() leaves out of the text too) and tags. None of
+# them runs across a NUL, which separates the texts the handlers scan in one call
+_MARKUP_RE = re.compile(
+    r'<!--[^\0]*?-->|<(script|style|template)\b[^>\0]*>[^\0]*?</\1\s*>|<[^<>\0]+>',
+    re.IGNORECASE
+)
+
+# Every method below needs an @ sign, an obfuscated "at" token, or markup (whose
+# text may join into one) to find an email; texts with none of them are skipped
+_EMAIL_HINT_RE = re.compile(r'[@<]|[(\[{](?:at|a|et)[)\]}]|\sat\s', re.IGNORECASE)
+
+def may_contain_email(text):
+    """
+    Cheaply check whether extract_emails_from_text could find an email in a text.
+    
+    Args:
+        text (str): The text to check
+        
+    Returns:
+        bool: False if the text certainly holds no email
+    """
+    return '@' in text or _EMAIL_HINT_RE.search(text) is not None
+
+# Characters an email's local part is made of
+_ADDRESS_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+
+def _is_email_match_start(text, start):
+    """
+    Check that an _EMAIL_RE match starting at the given position begins an email.
+    
+    A match right after an address character is the tail of a local part longer
+    than the pattern allows, which is not an address that appears in the text.
+    
+    Args:
+        text (str): The text that was searched
+        start (int): Start position of the match
+        
+    Returns:
+        bool: True if the match is a whole email
+    """
+    return start == 0 or text[start - 1] not in _ADDRESS_CHARS
+
 def extract_all_email_types(text):
     """Extract both standard and obfuscated emails from text."""
     if not text:
         return []
     
-    all_emails = []
-    
-    # Extract standard emails
-    standard_emails = re.findall(EMAIL_REGEX, text)
-    for email in standard_emails:
-        if is_valid_email(email):
-            all_emails.append(email)
-    
-    # Define patterns for obfuscated emails with careful boundaries
-    # These patterns are designed to avoid partial matches
-    obfuscation_patterns = [
-        # (at) format with careful word boundaries
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\(at\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # [at] format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\[at\]\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # <at> format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*<at>\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # {at} format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\{at\}\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # (a) format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\(a\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # [a] format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\[a\]\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # <a> format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*<a>\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # {a} format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\{a\}\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # at format (with spaces)
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s+at\s+([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # (et) format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\(et\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # [et] format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\[et\]\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # <et> format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*<et>\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-        # {et} format
-        r'(?<![a-zA-Z0-9._%+\-])([a-zA-Z0-9._%+\-]+)\s*\{et\}\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})(?![a-zA-Z0-9._%+\-])',
-    ]
+    # Cheap check first, as most attribute values and text nodes hold no email
+    if not may_contain_email(text):
+        return []
     
-    # Process each pattern
-    for pattern in obfuscation_patterns:
-        try:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                if len(match) == 2:  # Should have username and domain parts
-                    username, domain = match
-                    email = f"{username}@{domain}"
-                    if is_valid_email(email):
-                        all_emails.append(email)
-        except re.error:
-            # Skip patterns that cause regex errors (lookbehind issues)
-            continue
+    # Emails found so far by their lowercased form, so duplicates are dropped (keeping
+    # the first spelling seen) as they are found, before they are validated again
+    found = {}
+    
+    # Extract standard emails (skipping the truncated tails of overlong local parts)
+    for match in _EMAIL_RE.finditer(text):
+        email = match.group()
+        key = email.lower()
+        if key not in found and _is_email_match_start(text, match.start()) and is_valid_email(email):
+            found[key] = email
+    
+    # Extract obfuscated emails, in a single scan for all the obfuscated forms. Matches of
+    # an @ sign overlapping the previous one of the same sign are dropped, and the rest
+    # are reported grouped by @ sign, as with a separate scan per sign
+    matches = []
+    match_ends = {}
+    for match in _OBFUSCATED_EMAIL_RE.finditer(text):
+        at_sign = match.group(2).lower()
+        if match.start() >= match_ends.get(at_sign, 0):
+            match_ends[at_sign] = match.end(3)
+            matches.append((_OBFUSCATED_AT_SIGN_ORDER[at_sign], match.group(1), match.group(3)))
+    matches.sort(key=lambda entry: entry[0])
+    
+    for _, username, domain in matches:
+        email = f"{username}@{domain}"
+        key = email.lower()
+        if key not in found and is_valid_email(email):
+            found[key] = email
     
     # Special case for HTML content - try a different approach for HTML
     if '<' in text and '>' in text:
-        # Extract text content from HTML to avoid tag interference
-        try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(text, 'html.parser')
-            text_content = soup.get_text()
-            
-            # Simple patterns for common obfuscations in plain text
-            simple_patterns = [
-                r'([a-zA-Z0-9._%+\-]+)\s*\(at\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s*\[at\]\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s*<at>\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s*\{at\}\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s*\(a\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s+at\s+([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+\-]+)\s*\(et\)\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-            ]
-            
-            for pattern in simple_patterns:
-                matches = re.findall(pattern, text_content)
-                for match in matches:
-                    if len(match) == 2:
-                        username, domain = match
-                        email = f"{username}@{domain}"
-                        if is_valid_email(email):
-                            all_emails.append(email)
-        except ImportError:
-            # If BeautifulSoup is not available, use a simpler approach
-            # Direct pattern matching on the raw HTML
-            html_patterns = [
-                r'([a-zA-Z0-9._%+\-]+)\s*(?:\(at\)|\[at\]|<at>|\{at\}|\(a\)|\[a\]|<a>|\{a\}|\s+at\s+|\(et\)|\[et\]|<et>|\{et\})\s*([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})',
-            ]
-            
-            for pattern in html_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if len(match) == 2:
-                        username, domain = match
-                        email = f"{username}@{domain}"
-                        if is_valid_email(email):
-                            all_emails.append(email)
-    
-    # Direct string search for specific patterns in the original text
-    # This is a fallback for cases that the regex patterns might miss
-    text_lower = text.lower()
-    
-    # Look for common obfuscation patterns directly
-    obfuscation_markers = ['(at)', '[at]', '<at>', '{at}', '(a)', '[a]', '<a>', '{a}', ' at ', '(et)', '[et]', '<et>', '{et}']
-    
-    for marker in obfuscation_markers:
-        marker_lower = marker.lower()
-        if marker_lower in text_lower:
-            # Find all occurrences of the marker
-            positions = [m.start() for m in re.finditer(re.escape(marker_lower), text_lower)]
-            
-            for pos in positions:
-                # Look for username before the marker
-                username_end = pos
-                username_start = max(0, username_end - 50)  # Look back up to 50 chars
-                username_text = text_lower[username_start:username_end]
-                
-                # Extract potential username
-                username_match = re.search(r'([a-zA-Z0-9._%+\-]+)$', username_text)
-                if not username_match:
-                    continue
-                
-                username = username_match.group(1)
-                
-                # Look for domain after the marker
-                domain_start = pos + len(marker_lower)
-                domain_end = min(len(text_lower), domain_start + 50)  # Look ahead up to 50 chars
-                domain_text = text_lower[domain_start:domain_end]
-                
-                # Extract potential domain
-                domain_match = re.search(r'^([a-zA-Z0-9.\-]+\.[a-zA-Z]{2,})', domain_text)
-                if not domain_match:
-                    continue
-                
-                domain = domain_match.group(1)
-                
-                # Construct email
+        # Extract text content from HTML to avoid tag interference. The markup is
+        # stripped with a regex rather than by building a tree, as this runs on the
+        # raw HTML of every page, which the handlers have already parsed
+        text_content = unescape(_MARKUP_RE.sub('', text))
+        
+        for pattern in _SIMPLE_OBFUSCATION_PATTERNS:
+            for username, domain in pattern.findall(text_content):
                 email = f"{username}@{domain}"
-                if is_valid_email(email):
-                    all_emails.append(email)
+                key = email.lower()
+                if key not in found and is_valid_email(email):
+                    found[key] = email
     
     # Add edge case handling at the end
-    edge_case_emails = extract_edge_case_emails(text)
-    all_emails.extend(edge_case_emails)
-    
-    # Remove duplicates while preserving order
-    unique_emails = []
-    seen = set()
-    for email in all_emails:
-        email_lower = email.lower()
-        if email_lower not in seen:
-            seen.add(email_lower)
-            unique_emails.append(email)
+    for email in extract_edge_case_emails(text):
+        found.setdefault(email.lower(), email)
     
-    return unique_emails
+    return list(found.values())
 
 def extract_emails_from_text(text):
     """Extract email addresses from text using regex."""
     return extract_all_email_types(text)
 
+class EmailList(dict):
+    """
+    Insertion-ordered set of emails that takes list-style append() and extend().
+    
+    Duplicates are dropped as the extraction methods add emails, so no
+    separate deduplication pass is needed afterwards.
+    """
+    
+    def append(self, email):
+        self[email] = None
+    
+    def extend(self, emails):
+        for email in emails:
+            self[email] = None
+
+# Joomla-style email cloaking: var addy... = 'something' + '&#64;'; addy... = addy... + 'domain' + '&#46;' + 'tld';
+_JS_ADDY_RE = re.compile(r"var\s+([a-zA-Z0-9_]+)\s*=\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#64;|@)['\"]);\s*\1\s*=\s*\1\s*\+\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#46;|\.)['\"])(?:\s*\+\s*['\"]([^'\"]+)['\"]);")
+# document.getElementById('cloak...').innerHTML = ''; var prefix = '&#109;a' + 'i&#108;' + '&#116;o'; var path = 'hr' + 'ef' + '=';
+_JS_CLOAK_RE = _compile_linear(r"document\.getElementById\(['\"]cloak([a-zA-Z0-9]+)['\"]\)\.innerHTML\s*=\s*['\"](?:[^'\"]*)['\"];\s*var\s+([a-zA-Z0-9_]+)\s*=\s*['\"](?:[^'\"]+)['\"](?:\s*\+\s*['\"](?:[^'\"]+)['\"])+;\s*var\s+([a-zA-Z0-9_]+)\s*=\s*['\"](?:[^'\"]+)['\"](?:\s*\+\s*['\"](?:[^'\"]+)['\"])+;\s*var\s+([a-zA-Z0-9_]+)([a-zA-Z0-9_]*)\s*=\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#64;|@)['\"]);")
+# The domain part that the cloak pattern's address variable is then extended with:
+# addy... = addy... + 'domain' + '&#46;' + 'tld';
+_JS_CLOAK_DOMAIN_RE = re.compile(r"([a-zA-Z0-9_]+)\s*=\s*\1\s*\+\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#46;|\.)['\"])(?:\s*\+\s*['\"]([^'\"]+)['\"]);")
+
 def extract_obfuscated_emails_from_js(js_code):
     """Extract emails that are obfuscated in JavaScript code."""
     if not js_code:
@@ -469,60 +615,69 @@ def extract_obfuscated_emails_from_js(js_code):
     js_code = decode_email_entities(js_code)
     
     # Find variable assignments that might contain email parts
-    var_assignments = re.finditer(JS_VAR_ASSIGNMENT_REGEX, js_code)
+    var_assignments = _JS_VAR_ASSIGNMENT_RE.finditer(js_code)
     for match in var_assignments:
         var_name = match.group(1)
         value1 = match.group(2)
         value2 = match.group(3)
         js_vars[var_name] = value1 + value2
     
-    # Find variable additions that might build email addresses
-    var_additions = re.finditer(JS_VAR_ADDITION_REGEX, js_code)
-    for match in var_additions:
-        var_name = match.group(1)
-        if var_name in js_vars:
-            value1 = match.group(2)
-            value2 = match.group(3)
-            js_vars[var_name] = js_vars[var_name] + value1 + value2
-    
-    # Find more complex variable additions with entities
-    var_additions_with_entity = re.finditer(JS_VAR_ADDITION_WITH_ENTITY_REGEX, js_code)
-    for match in var_additions_with_entity:
-        var_name = match.group(1)
-        if var_name in js_vars:
-            value1 = match.group(2)
-            value2 = match.group(3)
-            value3 = match.group(4)
-            js_vars[var_name] = js_vars[var_name] + value1 + value2 + value3
+    # The additions below only extend variables assigned above, so their
+    # (backreferencing) patterns are skipped when there are none
+    if js_vars:
+        # Find variable additions that might build email addresses
+        var_additions = _JS_VAR_ADDITION_RE.finditer(js_code)
+        for match in var_additions:
+            var_name = match.group(1)
+            if var_name in js_vars:
+                value1 = match.group(2)
+                value2 = match.group(3)
+                js_vars[var_name] = js_vars[var_name] + value1 + value2
+        
+        # Find more complex variable additions with entities
+        var_additions_with_entity = _JS_VAR_ADDITION_WITH_ENTITY_RE.finditer(js_code)
+        for match in var_additions_with_entity:
+            var_name = match.group(1)
+            if var_name in js_vars:
+                value1 = match.group(2)
+                value2 = match.group(3)
+                value3 = match.group(4)
+                js_vars[var_name] = js_vars[var_name] + value1 + value2 + value3
     
     # Extract emails from the variables
     for var_name, value in js_vars.items():
         potential_emails = extract_emails_from_text(value)
         emails.extend(potential_emails)
     
+    # The remaining patterns all need an @ sign (entities such as &#64; are
+    # decoded above), which a single substring search rules out for most scripts
+    if '@' not in js_code:
+        return _unique_js_emails(emails)
+    
     # Look for direct email parts in JavaScript
-    email_parts_matches = re.finditer(JS_EMAIL_PARTS_REGEX, js_code)
+    email_parts_matches = _JS_EMAIL_PARTS_RE.finditer(js_code)
     for match in email_parts_matches:
         username = match.group(1)
         at_sign = '@' if match.group(2) in ('@', '&#64;', '&commat;') else match.group(2)
         
-        # Look for domain parts that might follow
-        domain_matches = re.finditer(JS_EMAIL_DOMAIN_REGEX, js_code[match.end():])
-        for domain_match in domain_matches:
-            domain = domain_match.group(1)
-            dot = '.' if domain_match.group(2) in ('.', '&#46;', '&period;') else domain_match.group(2)
-            tld = domain_match.group(3)
-            
-            # Construct the email
-            email = f"{username}{at_sign}{domain}{dot}{tld}"
-            if is_valid_email(email):
-                emails.append(email)
-            break  # Only use the first domain match
+        # Look for the first domain part that follows. When there is none, none
+        # follows the later username parts either, so the search stops there
+        # instead of rescanning the rest of the script for each of them
+        domain_match = _JS_EMAIL_DOMAIN_RE.search(js_code, match.end())
+        if domain_match is None:
+            break
+        domain = domain_match.group(1)
+        dot = '.' if domain_match.group(2) in ('.', '&#46;', '&period;') else domain_match.group(2)
+        tld = domain_match.group(3)
+        
+        # Construct the email
+        email = f"{username}{at_sign}{domain}{dot}{tld}"
+        if is_valid_email(email):
+            emails.append(email)
     
     # Special handling for the specific pattern in the provided HTML snippet
     # This pattern looks for: var addy... = 'something' + '&#64;'; addy... = addy... + 'domain' + '&#46;' + 'tld';
-    pattern = r"var\s+([a-zA-Z0-9_]+)\s*=\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#64;|@)['\"]);\s*\1\s*=\s*\1\s*\+\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#46;|\.)['\"])(?:\s*\+\s*['\"]([^'\"]+)['\"]);"
-    matches = re.finditer(pattern, js_code)
+    matches = _JS_ADDY_RE.finditer(js_code)
     for match in matches:
         username = match.group(2)
         domain = match.group(3)
@@ -532,24 +687,28 @@ def extract_obfuscated_emails_from_js(js_code):
             emails.append(email)
     
     # Another pattern: document.getElementById('cloak...').innerHTML = ''; var prefix = '&#109;a' + 'i&#108;' + '&#116;o'; var path = 'hr' + 'ef' + '=';
-    cloak_pattern = r"document\.getElementById\(['\"]cloak([a-zA-Z0-9]+)['\"]\)\.innerHTML\s*=\s*['\"](?:[^'\"]*)['\"];\s*var\s+([a-zA-Z0-9_]+)\s*=\s*['\"](?:[^'\"]+)['\"](?:\s*\+\s*['\"](?:[^'\"]+)['\"])+;\s*var\s+([a-zA-Z0-9_]+)\s*=\s*['\"](?:[^'\"]+)['\"](?:\s*\+\s*['\"](?:[^'\"]+)['\"])+;\s*var\s+([a-zA-Z0-9_]+)([a-zA-Z0-9_]*)\s*=\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#64;|@)['\"]);"
-    cloak_matches = re.finditer(cloak_pattern, js_code)
+    cloak_matches = _JS_CLOAK_RE.finditer(js_code)
     for match in cloak_matches:
         var_name = match.group(4) + match.group(5)
         username = match.group(6)
         
-        # Look for the next part that builds the domain
-        domain_pattern = rf"{var_name}\s*=\s*{var_name}\s*\+\s*['\"]([^'\"]+)['\"](?:\s*\+\s*['\"](?:&#46;|\.)['\"])(?:\s*\+\s*['\"]([^'\"]+)['\"]);"
-        domain_matches = re.finditer(domain_pattern, js_code[match.end():])
-        for domain_match in domain_matches:
-            domain = domain_match.group(1)
-            tld = domain_match.group(2)
+        # Look for the next part that builds the domain, on this variable (a single
+        # pattern matches the additions to any variable, so none is compiled per
+        # match; the search starts at the match instead of on a copy of the script)
+        for domain_match in _JS_CLOAK_DOMAIN_RE.finditer(js_code, match.end()):
+            if domain_match.group(1) != var_name:
+                continue
+            domain = domain_match.group(2)
+            tld = domain_match.group(3)
             email = f"{username}@{domain}.{tld}"
             if is_valid_email(email):
                 emails.append(email)
-            break  # Only use the first domain match
+            break
     
-    # Remove duplicates
+    return _unique_js_emails(emails)
+
+def _unique_js_emails(emails):
+    """Remove duplicate (case-insensitively) and invalid emails, preserving order."""
     unique_emails = []
     seen = set()
     for email in emails:
@@ -560,28 +719,40 @@ def extract_obfuscated_emails_from_js(js_code):
     
     return unique_emails
 
+_VALID_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', re.ASCII)
+# Placeholder domains, which are all literal, so they are looked up in a set
+_INVALID_EMAIL_DOMAINS = frozenset([
+    'example.com', 'sample.com', 'domain.com', 'email.com', 'test.com', 'yourcompany.com'
+])
+
+@lru_cache(maxsize=4096)
 def is_valid_email(email):
-    """Validate an email address."""
+    """Validate an email address (cached, as the same candidates recur across methods and pages)."""
     # Basic validation
-    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+    if not _VALID_EMAIL_RE.fullmatch(email):
         return False
     
-    # Check for common invalid patterns
-    invalid_patterns = [
-        r'@example\.com$',
-        r'@sample\.com$',
-        r'@domain\.com$',
-        r'@email\.com$',
-        r'@test\.com$',
-        r'@yourcompany\.com$',
-    ]
-    
-    for pattern in invalid_patterns:
-        if re.search(pattern, email, re.IGNORECASE):
-            return False
+    # Check for common invalid patterns (a valid address has a single @)
+    if email.rpartition('@')[2].lower() in _INVALID_EMAIL_DOMAINS:
+        return False
     
     return True
 
+# dnspython resolver shared by every verify_mx_record() call, created on first use
+_mx_resolver = None
+
+def _get_mx_resolver():
+    """Return the shared dnspython resolver, configured to give up after MX_LOOKUP_TIMEOUT."""
+    global _mx_resolver
+    if _mx_resolver is None:
+        import dns.resolver
+        
+        resolver = dns.resolver.Resolver()
+        resolver.timeout = MX_LOOKUP_TIMEOUT / 2  # Per nameserver attempt
+        resolver.lifetime = MX_LOOKUP_TIMEOUT  # For the whole lookup, retries included
+        _mx_resolver = resolver
+    return _mx_resolver
+
 def verify_mx_record(domain):
     """
     Verify if a domain has valid MX records.
@@ -590,27 +761,65 @@ def verify_mx_record(domain):
         domain (str): The domain to check
         
     Returns:
-        bool: True if the domain has valid MX records, False otherwise
+        bool or None: True if the domain has valid MX records, False if it has
+            none, None if the lookup failed (e.g. timed out) so it is unknown
     """
     try:
         import dns.resolver
         
         # Try to get MX records for the domain
-        mx_records = dns.resolver.resolve(domain, 'MX')
+        mx_records = _get_mx_resolver().resolve(domain, 'MX')
         
         # If we got here, the domain has MX records
         return len(mx_records) > 0
-    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers, dns.exception.Timeout):
-        # No MX records found or DNS resolution failed
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+        # No MX records found, or the domain doesn't exist
         return False
+    except (dns.resolver.NoNameservers, dns.exception.Timeout) as e:
+        # The lookup failed or ran out of time, which says nothing about the domain
+        logger.warning(f"MX lookup for {domain} failed: {str(e)}")
+        return None
     except ImportError:
-        # If dns.resolver is not available, assume the domain is valid
+        # If dns.resolver is not available, the domain can't be checked
         logger.warning("dnspython package not installed. MX record verification disabled.")
-        return True
+        return None
     except Exception as e:
-        # Any other error, log it and assume the domain is valid
+        # Any other error, log it and report the result as unknown
+        logger.warning(f"Error verifying MX record for {domain}: {str(e)}")
+        return None
+
+async def verify_mx_record_async(domain, resolver):
+    """
+    Verify if a domain has valid MX records using a shared aiodns resolver.
+    
+    This uses DNSResolver.query(), so aiodns is pinned below 3.5 (which
+    deprecates it in favor of query_dns()).
+    
+    Args:
+        domain (str): The domain to check
+        resolver (aiodns.DNSResolver): The resolver to send the query through
+        
+    Returns:
+        bool or None: True if the domain has valid MX records, False if it has
+            none, None if the lookup failed (e.g. timed out) so it is unknown
+    """
+    import aiodns
+    
+    try:
+        # Try to get MX records for the domain
+        mx_records = await resolver.query(domain, 'MX')
+        
+        # If we got here, the domain has MX records
+        return len(mx_records) > 0
+    except aiodns.error.DNSError as e:
+        # No MX records found, or the domain doesn't exist
+        if e.args and e.args[0] in (aiodns.error.ARES_ENODATA, aiodns.error.ARES_ENOTFOUND):
+            return False
+        
+        # Any other error (a timeout, or a failing or refusing server) says nothing
+        # about the domain, so log it and report the result as unknown
         logger.warning(f"Error verifying MX record for {domain}: {str(e)}")
-        return True
+        return None
 
 def get_email_domain(email):
     """
@@ -627,25 +836,27 @@ def get_email_domain(email):
     
     return email.split('@', 1)[1]
 
+# ROT13 translation table, so decoding is a single str.translate() call
+_ROT13_TABLE = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
+    'NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm'
+)
+
 def rot13_decode(text):
     """Decode ROT13 encoded text."""
     if not text:
         return ""
     
-    result = ""
-    for char in text:
-        if 'a' <= char <= 'z':
-            result += chr((ord(char) - ord('a') + 13) % 26 + ord('a'))
-        elif 'A' <= char <= 'Z':
-            result += chr((ord(char) - ord('A') + 13) % 26 + ord('A'))
-        else:
-            result += char
-    return result
+    return text.translate(_ROT13_TABLE)
 
+@lru_cache(maxsize=4096)
 def decode_data_enc_email(encoded_email):
     """
     Decode emails from data-enc-email attribute which often uses ROT13 encoding.
     
+    Results are cached, as template-generated contact widgets repeat the same
+    encoded email on every page of a site.
+    
     Args:
         encoded_email (str): The encoded email from data-enc-email attribute
         
@@ -672,17 +883,10 @@ def decode_data_enc_email(encoded_email):
     # Try simple character replacement (another common method)
     try:
         # Create a translation table for a simple substitution cipher
-        # This handles cases where a custom character mapping is used
-        char_map = {}
-        for i, c in enumerate("abcdefghijklmnopqrstuvwxyz"):
-            char_map[encoded_email[i]] = c
-        
-        decoded = ""
-        for char in encoded_email:
-            if char in char_map:
-                decoded += char_map[char]
-            else:
-                decoded += char
+        # This handles cases where a custom character mapping is used (the first 26
+        # characters map to the alphabet; shorter texts raise, as they can't hold it)
+        table = str.maketrans(encoded_email[:26], "abcdefghijklmnopqrstuvwxyz")
+        decoded = encoded_email.translate(table)
         
         if '@' in decoded and is_valid_email(decoded):
             return decoded
@@ -692,6 +896,11 @@ def decode_data_enc_email(encoded_email):
     # If all decoding attempts fail, return None
     return None
 
+@lru_cache(maxsize=256)
+def _xor_table(key):
+    """Return the translation table XORing every byte with the key (cached per key)."""
+    return bytes(i ^ key for i in range(256))
+
 def xor_decode(text, key):
     """
     Decode XOR encoded text with a numeric key.
@@ -706,15 +915,23 @@ def xor_decode(text, key):
     if not text:
         return ""
     
-    result = ""
-    for char in text:
-        result += chr(ord(char) ^ key)
-    return result
+    # Latin-1 text XORed with a byte-sized key stays in Latin-1, so it is decoded
+    # with a single bytes.translate() call instead of a loop per character
+    if 0 <= key < 256:
+        try:
+            return text.encode('latin-1').translate(_xor_table(key)).decode('latin-1')
+        except UnicodeEncodeError:
+            pass
+    
+    return ''.join(chr(ord(char) ^ key) for char in text)
 
+@lru_cache(maxsize=4096)
 def decode_base64(text):
     """
     Decode base64 encoded text.
     
+    Results are cached, as the same encoded values recur across pages.
+    
     Args:
         text (str): The base64 encoded text
         
@@ -749,26 +966,24 @@ def extract_emails_from_reversed_text(text):
     if not text:
         return []
     
-    emails = []
-    
     # Try normal extraction
-    normal_emails = extract_emails_from_text(text)
-    emails.extend(normal_emails)
+    emails = extract_emails_from_text(text)
     
-    # Try reversed extraction
-    reversed_text = text[::-1]
-    reversed_emails = extract_emails_from_text(reversed_text)
-    emails.extend(reversed_emails)
+    # Try reversed extraction, only when the text reads as holding no email. Text
+    # that does is not reversed, and reversing it only turns its emails into
+    # garbled ones (sales.team@x.com reads as moc.x@maet.selas)
+    if not emails:
+        emails = extract_emails_from_text(text[::-1])
     
-    # Remove duplicates
-    unique_emails = []
-    seen = set()
-    for email in emails:
-        if email not in seen:
-            seen.add(email)
-            unique_emails.append(email)
-    
-    return unique_emails
+    # Remove duplicates, preserving order
+    return list(dict.fromkeys(emails))
+
+# Strings made of base64 characters only
+_BASE64_RE = re.compile(r'^[A-Za-z0-9+/=]+$')
+
+# Length of the shortest email EMAIL_REGEX matches (a@b.co); the ROT13, XOR and
+# base64 decodings of a shorter value are never longer, so can't hold one
+_MIN_EMAIL_LENGTH = 6
 
 def extract_emails_from_data_attributes(attributes):
     """
@@ -820,22 +1035,26 @@ def extract_emails_from_data_attributes(attributes):
         direct_emails = extract_emails_from_text(encoded_email)
         emails.extend(direct_emails)
         
-        # Try decoding if it looks like base64
-        if re.match(r'^[A-Za-z0-9+/=]+$', encoded_email):
-            decoded = decode_base64(encoded_email)
-            decoded_emails = extract_emails_from_text(decoded)
-            emails.extend(decoded_emails)
-        
-        # Try ROT13 decoding
-        rot13_decoded = rot13_decode(encoded_email)
-        rot13_emails = extract_emails_from_text(rot13_decoded)
-        emails.extend(rot13_emails)
-        
-        # Try common XOR keys
-        for key in [13, 42, 7, 1]:
-            xor_decoded = xor_decode(encoded_email, key)
-            xor_emails = extract_emails_from_text(xor_decoded)
-            emails.extend(xor_emails)
+        # Only try the decoders when the value holds no plain email (decoding one
+        # only adds garbled copies of it, such as its ROT13 form) and is long
+        # enough to encode the shortest email (a@b.co)
+        if not direct_emails and len(encoded_email) >= _MIN_EMAIL_LENGTH:
+            # Try decoding if it looks like base64
+            if _BASE64_RE.match(encoded_email):
+                decoded = decode_base64(encoded_email)
+                decoded_emails = extract_emails_from_text(decoded)
+                emails.extend(decoded_emails)
+            
+            # Try ROT13 decoding
+            rot13_decoded = rot13_decode(encoded_email)
+            rot13_emails = extract_emails_from_text(rot13_decoded)
+            emails.extend(rot13_emails)
+            
+            # Try common XOR keys
+            for key in [13, 42, 7, 1]:
+                xor_decoded = xor_decode(encoded_email, key)
+                xor_emails = extract_emails_from_text(xor_decoded)
+                emails.extend(xor_emails)
     
     # Pattern 4.5: data-enc-email (specifically for ROT13 encoded emails)
     if 'data-enc-email' in attributes:
@@ -844,35 +1063,45 @@ def extract_emails_from_data_attributes(attributes):
         if decoded_email:
             emails.append(decoded_email)
     
-    # Pattern 5: data-mail-* attributes
-    mail_parts = {}
-    for key, value in attributes.items():
-        if key.startswith('data-mail-'):
-            part_name = key[10:]  # Remove 'data-mail-'
-            mail_parts[part_name] = value
-    
-    # Try to construct email from parts
-    if 'user' in mail_parts and 'domain' in mail_parts:
-        user = mail_parts['user']
-        domain = mail_parts['domain']
+    # Pattern 5: data-mail-* attributes (only the user and domain parts are used,
+    # so they are looked up directly rather than by scanning every attribute)
+    if 'data-mail-user' in attributes and 'data-mail-domain' in attributes:
+        user = attributes['data-mail-user']
+        domain = attributes['data-mail-domain']
         email = f"{user}@{domain}"
         if is_valid_email(email):
             emails.append(email)
     
-    # Remove duplicates
-    unique_emails = []
-    seen = set()
-    for email in emails:
-        if email not in seen:
-            seen.add(email)
-            unique_emails.append(email)
+    # Remove duplicates, preserving order
+    return list(dict.fromkeys(emails))
+
+def _extract_emails_from_json_value(value, emails):
+    """
+    Extract emails from every string in parsed JSON data.
     
-    return unique_emails
+    Args:
+        value: The parsed JSON value (dict, list, str or scalar)
+        emails (EmailList): Collection the extracted email addresses are added to
+    """
+    if isinstance(value, str):
+        emails.extend(extract_emails_from_text(value))
+    elif isinstance(value, dict):
+        # Covers the email properties of Schema.org Person and Organization
+        # objects and their contactPoints, at any depth
+        for item in value.values():
+            _extract_emails_from_json_value(item, emails)
+    elif isinstance(value, list):
+        for item in value:
+            _extract_emails_from_json_value(item, emails)
 
 def extract_emails_from_json_ld(json_ld):
     """
     Extract emails from JSON-LD data.
     
+    The data is parsed (with orjson when it is installed) and every string
+    value is searched, so JSON escapes are decoded and keys and syntax are
+    never scanned. Data that doesn't parse is searched as plain text.
+    
     Args:
         json_ld (str): JSON-LD data as string
         
@@ -882,68 +1111,32 @@ def extract_emails_from_json_ld(json_ld):
     if not json_ld:
         return []
     
-    emails = []
-    
     try:
         # Parse JSON
-        data = json.loads(json_ld)
-        
-        # Convert to string for regex search
-        json_str = json.dumps(data)
-        
-        # Extract emails using regex
-        found_emails = re.findall(EMAIL_REGEX, json_str)
-        emails.extend(found_emails)
-        
-        # Look for specific JSON-LD properties that might contain emails
-        if isinstance(data, dict):
-            # Check for Schema.org Person or Organization
-            if '@type' in data and data['@type'] in ['Person', 'Organization']:
-                if 'email' in data:
-                    emails.append(data['email'])
-                
-                # Check for contactPoint
-                if 'contactPoint' in data:
-                    contact_points = data['contactPoint']
-                    if isinstance(contact_points, list):
-                        for cp in contact_points:
-                            if isinstance(cp, dict) and 'email' in cp:
-                                emails.append(cp['email'])
-                    elif isinstance(contact_points, dict) and 'email' in contact_points:
-                        emails.append(contact_points['email'])
-            
-            # Check for any property that might contain an email
-            for key, value in data.items():
-                if isinstance(value, str) and '@' in value:
-                    extracted = extract_emails_from_text(value)
-                    emails.extend(extracted)
-        
-        # If it's a list, check each item
-        elif isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    # Recursively check each item
-                    item_emails = extract_emails_from_json_ld(json.dumps(item))
-                    emails.extend(item_emails)
-    except Exception as e:
-        logger.debug(f"Error extracting emails from JSON-LD: {str(e)}")
-    
-    # Remove duplicates
-    unique_emails = []
-    seen = set()
-    for email in emails:
-        if email not in seen and is_valid_email(email):
-            seen.add(email)
-            unique_emails.append(email)
-    
-    return unique_emails
+        data = orjson.loads(json_ld) if orjson is not None else json.loads(json_ld)
+    except ValueError as e:
+        # Both json.JSONDecodeError and orjson.JSONDecodeError are ValueErrors
+        logger.debug(f"Error parsing JSON-LD, searching it as text: {str(e)}")
+        return extract_emails_from_text(json_ld)
+    
+    # Duplicates are dropped as the strings are searched
+    emails = EmailList()
+    _extract_emails_from_json_value(data, emails)
+    
+    # Remove invalid emails
+    return [email for email in emails if is_valid_email(email)]
+
+# Meta tag names (might contain email-related keywords) and Open Graph properties
+# whose content is searched even without an @ sign
+_EMAIL_META_NAMES = frozenset(['email', 'e-mail', 'contact', 'author'])
+_EMAIL_META_PROPERTIES = frozenset(['og:email', 'og:contact', 'article:author'])
 
 def extract_emails_from_meta_tags(meta_tags):
     """
     Extract emails from meta tags.
     
     Args:
-        meta_tags (list): List of BeautifulSoup meta tag elements
+        meta_tags (list): List of meta tag elements (lxml HtmlElements)
         
     Returns:
         list: List of extracted email addresses
@@ -951,47 +1144,38 @@ def extract_emails_from_meta_tags(meta_tags):
     if not meta_tags:
         return []
     
-    emails = []
+    # Contents worth searching: those with an @ sign, and those of the email-related
+    # names and Open Graph properties (which may hold an obfuscated email)
+    contents = []
     
     for tag in meta_tags:
-        # Check content attribute
         content = tag.get('content', '')
-        if content and '@' in content:
-            content_emails = extract_emails_from_text(content)
-            emails.extend(content_emails)
-        
-        # Check name attribute (might contain email-related keywords)
-        name = tag.get('name', '').lower()
-        if name in ['email', 'e-mail', 'contact', 'author']:
-            content = tag.get('content', '')
-            if content:
-                content_emails = extract_emails_from_text(content)
-                emails.extend(content_emails)
+        if not content:
+            continue
         
-        # Check property attribute (Open Graph)
-        prop = tag.get('property', '').lower()
-        if prop in ['og:email', 'og:contact', 'article:author']:
-            content = tag.get('content', '')
-            if content:
-                content_emails = extract_emails_from_text(content)
-                emails.extend(content_emails)
-    
-    # Remove duplicates
-    unique_emails = []
-    seen = set()
-    for email in emails:
-        if email not in seen and is_valid_email(email):
-            seen.add(email)
-            unique_emails.append(email)
+        if (
+            '@' in content
+            or tag.get('name', '').lower() in _EMAIL_META_NAMES
+            or tag.get('property', '').lower() in _EMAIL_META_PROPERTIES
+        ):
+            contents.append(content)
+    
+    if not contents:
+        return []
     
-    return unique_emails
+    # Search every content in one pass, joined with a NUL character, which none
+    # of the email patterns matches, so no email spans two contents
+    emails = extract_emails_from_text('\0'.join(contents))
+    
+    # Remove duplicates (preserving order) and invalid emails
+    return [email for email in dict.fromkeys(emails) if is_valid_email(email)]
 
 def extract_emails_from_accessibility_attributes(elements):
     """
     Extract emails from accessibility attributes like aria-label and title.
     
     Args:
-        elements (list): List of BeautifulSoup elements
+        elements (list): List of elements (lxml HtmlElements)
         
     Returns:
         list: List of extracted email addresses
@@ -999,79 +1183,241 @@ def extract_emails_from_accessibility_attributes(elements):
     if not elements:
         return []
     
-    emails = []
+    # Attribute values with an @ sign, in element order
+    values = []
     
     for element in elements:
         # Check aria-label attribute
         aria_label = element.get('aria-label', '')
         if aria_label and '@' in aria_label:
-            aria_emails = extract_emails_from_text(aria_label)
-            emails.extend(aria_emails)
+            values.append(aria_label)
         
         # Check title attribute
         title = element.get('title', '')
         if title and '@' in title:
-            title_emails = extract_emails_from_text(title)
-            emails.extend(title_emails)
+            values.append(title)
         
         # Check alt attribute (for images)
-        if element.name == 'img':
+        if element.tag == 'img':
             alt = element.get('alt', '')
             if alt and '@' in alt:
-                alt_emails = extract_emails_from_text(alt)
-                emails.extend(alt_emails)
+                values.append(alt)
     
-    # Remove duplicates
-    unique_emails = []
-    seen = set()
-    for email in emails:
-        if email not in seen and is_valid_email(email):
-            seen.add(email)
-            unique_emails.append(email)
+    if not values:
+        return []
     
-    return unique_emails
+    # Search every value in one pass, joined with a NUL character, which none
+    # of the email patterns matches, so no email spans two values
+    emails = extract_emails_from_text('\0'.join(values))
+    
+    # Remove duplicates (preserving order) and invalid emails
+    return [email for email in dict.fromkeys(emails) if is_valid_email(email)]
+
+# Attributes left to the specific checks by the generic attribute scan
+SPECIFIC_ATTRIBUTES = frozenset(['href', 'onclick', 'title', 'alt', 'placeholder'])
+
+# Elements whose text content is scanned for emails
+TEXT_CONTENT_TAGS = frozenset(['address', 'pre', 'code', 'output', 'details', 'summary', 'blockquote', 'cite', 'q'])
+
+# Elements inside an SVG, whose attributes are all scanned
+_SVG_DESCENDANTS_XPATH = etree.XPath('//svg//*')
+
+def extract_emails_from_tree(tree, emails):
+    """
+    Extract emails from the visible text, comments, elements and attributes of a page.
+    
+    The tree is walked once, dispatching on each node instead of making one search
+    pass per method, and the texts worth scanning are searched in a single call
+    once the walk is done.
+    
+    Args:
+        tree (HtmlElement): The parsed HTML
+        emails (EmailList): Collection the extracted email addresses are added to
+    """
+    # Texts to scan for emails, starting with the visible text. The NUL they are
+    # joined with keeps emails and markup from joining across them
+    texts = [get_text(tree, " ", strip=True)]
+    
+    svg_elements = set(_SVG_DESCENDANTS_XPATH(tree))
+    
+    for node in tree.iter():
+        if isinstance(node.tag, str):
+            _extract_emails_from_element(node, emails, texts, node in svg_elements)
+        elif node.tag is etree.Comment and node.text:
+            # HTML comments
+            texts.append(node.text)
+    
+    emails.extend(extract_emails_from_text('\0'.join(texts)))
+
+def _extract_emails_from_element(tag, emails, texts, in_svg=False):
+    """
+    Extract emails from a single element, for every check that inspects it.
+    
+    Args:
+        tag (HtmlElement): The element to inspect
+        emails (EmailList): Collection the extracted email addresses are added to
+        texts (list): Texts to scan for emails after the walk, for the text-based checks
+        in_svg (bool): Whether the element is inside an SVG
+    """
+    name = tag.tag
+    attrs = tag.attrib
+    
+    # SVG content and custom elements have every attribute with an @ scanned,
+    # including the ones the specific checks handle
+    scan_all = in_svg or '-' in name
+    
+    # One pass over the element's attributes
+    for attr, value in attrs.items():
+        if attr in TOKEN_LIST_ATTRIBUTES:
+            continue
+        
+        if attr.startswith('data-'):
+            # Data attributes that might contain emails
+            emails.extend(extract_emails_from_text(value))
+            continue
+        if attr in ('title', 'placeholder') or (attr == 'alt' and name == 'img'):
+            # Attributes like title, alt and placeholder
+            emails.extend(extract_emails_from_text(value))
+            continue
+        if attr == 'onclick':
+            # Inline JavaScript in attributes
+            emails.extend(extract_obfuscated_emails_from_js(value))
+        
+        if (scan_all or attr not in SPECIFIC_ATTRIBUTES) and ('@' in value or '(at)' in value or '[at]' in value):
+            # Non-standard attributes that might be used for obfuscation (this also
+            # covers the datetime attribute of <time> elements)
+            emails.extend(extract_emails_from_text(value))
+    
+    if name == 'a':
+        href = attrs.get('href')
+        if href is not None and href.startswith('mailto:'):
+            # Mailto links
+            email = href[7:]  # Remove 'mailto:'
+            # Handle additional parameters in mailto links
+            if '?' in email:
+                email = email.split('?')[0]
+            if email:
+                emails.append(email)
+            
+            # Also check the text content of the link for emails
+            texts.append(get_text(tag, strip=True))
+    
+    elif name == 'script':
+        script = get_string(tag)
+        if script:
+            # JavaScript code
+            emails.extend(extract_obfuscated_emails_from_js(script))
+            
+            # Structured data (JSON-LD)
+            if attrs.get('type') == 'application/ld+json':
+                emails.extend(extract_emails_from_json_ld(script))
+    
+    elif name == 'noscript':
+        # Content of <noscript> tags
+        texts.append(get_text(tag))
+        
+        # Also check for obfuscated emails in noscript content
+        noscript = get_string(tag)
+        if noscript:
+            emails.extend(extract_obfuscated_emails_from_js(noscript))
+    
+    elif name == 'style':
+        # <style> tags (might contain emails in CSS comments)
+        style = get_string(tag)
+        if style and may_contain_email(style):
+            texts.append(style)
+    
+    elif name == 'time':
+        # Text of <time> elements
+        time_text = get_text(tag, strip=True)
+        if '@' in time_text:
+            texts.append(time_text)
+    
+    elif name == 'link':
+        # <link> tags with rel author or me
+        rel = attrs.get('rel')
+        href = attrs.get('href')
+        if rel is not None and any(r in ['author', 'me'] for r in rel.split()) and href is not None:
+            # Check for mailto: links
+            if href.startswith('mailto:'):
+                email = href[7:]  # Remove 'mailto:'
+                # Handle additional parameters in mailto links
+                if '?' in email:
+                    email = email.split('?')[0]
+                if email and is_valid_email(email):
+                    emails.append(email)
+            # Check for regular URLs that might contain emails
+            elif '@' in href:
+                emails.extend(extract_emails_from_text(href))
+    
+    elif name == 'input':
+        # Email input fields
+        value = attrs.get('value')
+        if attrs.get('type') == 'email' and value is not None:
+            if is_valid_email(value):
+                emails.append(value)
+    
+    elif name == 'svg':
+        # Text of SVG elements (their attributes are scanned as the walk reaches them)
+        svg_text = get_text(tag, strip=True)
+        if may_contain_email(svg_text):
+            texts.append(svg_text)
+    
+    elif name in TEXT_CONTENT_TAGS:
+        # Text of <address>, <pre>, <code>, <output>, <details>, <summary>,
+        # <blockquote>, <cite> and <q>
+        content_text = get_text(tag, strip=True)
+        if may_contain_email(content_text):
+            texts.append(content_text)
+    
+    if '-' in name:
+        # Text of custom elements and web components
+        component_text = get_text(tag, strip=True)
+        if may_contain_email(component_text):
+            texts.append(component_text)
+
+# Named entities used to hide the characters of an email, by name
+_EMAIL_NAMED_ENTITIES = {
+    'lt': '<',
+    'gt': '>',
+    'period': '.',
+    'commat': '@',
+    'hyphen': '-',
+    'lowbar': '_',
+    'dot': '.',
+    'at': '@',
+    'colon': ':',
+}
+
+# Any of the named entities above, or a decimal or hex numeric entity (which
+# covers &#64;, &#064;, &#x40; and the other zero-padded forms of each character)
+_EMAIL_ENTITY_RE = re.compile(
+    r'&(?:#(\d+)|#x([0-9a-fA-F]+)|(' + '|'.join(_EMAIL_NAMED_ENTITIES) + r'));'
+)
+
+def _decode_email_entity(match):
+    """Return the character an _EMAIL_ENTITY_RE match stands for."""
+    decimal, hexadecimal, name = match.groups()
+    if name is not None:
+        return _EMAIL_NAMED_ENTITIES[name]
+    if decimal is not None:
+        return chr(int(decimal))
+    return chr(int(hexadecimal, 16))
 
 def decode_email_entities(text):
     """Decode HTML entities in email addresses."""
     if not text:
         return ""
-        
-    # Common HTML entity replacements
-    entities = {
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&#64;': '@',
-        '&#46;': '.',
-        '&#45;': '-',
-        '&#95;': '_',
-        '&period;': '.',
-        '&commat;': '@',
-        '&hyphen;': '-',
-        '&lowbar;': '_',
-        '&dot;': '.',
-        '&at;': '@',
-        '&#064;': '@',
-        '&#0064;': '@',
-        '&#00064;': '@',
-        '&#000064;': '@',
-        '&#x40;': '@',
-        '&#x064;': '@',
-        '&#x0040;': '@',
-        '&colon;': ':',
-        '&#58;': ':',
-        '&#x3a;': ':',
-    }
-    
-    # Replace entities
-    for entity, char in entities.items():
-        text = text.replace(entity, char)
-    
-    # Handle numeric entities
-    text = re.sub(r'&#(\d+);', lambda m: chr(int(m.group(1))), text)
-    text = re.sub(r'&#x([0-9a-fA-F]+);', lambda m: chr(int(m.group(1), 16)), text)
-    
-    return text
+    
+    # Every entity starts with an ampersand, so most texts need no decoding at all
+    if '&' not in text:
+        return text
+    
+    # Decode &amp; first, so entities escaped twice (&amp;#64;) are decoded as well
+    text = text.replace('&amp;', '&')
+    
+    # Decode every other entity in a single pass over the text
+    return _EMAIL_ENTITY_RE.sub(_decode_email_entity, text)
 
 def test_mx_verification():
     """Test MX record verification for various domains."""
@@ -1094,16 +1440,20 @@ def test_mx_verification():
         'test.example'
     ]
     
+    # Look every domain up concurrently, as each lookup mostly waits on DNS
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(verify_mx_record, valid_domains + invalid_domains))
+    valid_results = results[:len(valid_domains)]
+    invalid_results = results[len(valid_domains):]
+    
     # Test valid domains
     print("Testing domains with valid MX records:")
-    for domain in valid_domains:
-        result = verify_mx_record(domain)
+    for domain, result in zip(valid_domains, valid_results):
         print(f"Domain: {domain}, Has MX records: {result}")
     
     # Test invalid domains
     print("\nTesting domains with invalid or non-existent MX records:")
-    for domain in invalid_domains:
-        result = verify_mx_record(domain)
+    for domain, result in zip(invalid_domains, invalid_results):
         print(f"Domain: {domain}, Has MX records: {result}")
     
     # Test email domain extraction